@@ -0,0 +1,272 @@
+import asyncio
+import os
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import Text, cast
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from . import json_codec, metrics
+from .chunking import SpooledChunks, store_result_chunks, take_chunks
+from .database import SessionLocal, FileRecord
+from .hash_cache import hash_cache
+from .isolation import ConversionLimitError
+from .pipeline_profiles import ConversionOptions
+from .search import index_new_records, index_record
+from .uploads import SpooledUpload, expand_archive, is_archive
+
+# Number of new records inserted per transaction
+BATCH_COMMIT_SIZE = int(os.getenv("BATCH_COMMIT_SIZE", "25"))
+
+
+def _line(result: Dict[str, Any]) -> bytes:
+    """One NDJSON line"""
+    return json_codec.dumps_bytes(result) + b"\n"
+
+
+def _result(spooled: SpooledUpload, status: str, file_id: Optional[int] = None,
+            file_type: Optional[str] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    metrics.FILES_TOTAL.inc(file_type=file_type or "unknown", status=status)
+    if status == "already_available":
+        metrics.DUPLICATE_HITS.inc(source="batch")
+    elif status == "duplicate_in_batch":
+        metrics.DUPLICATE_HITS.inc(source="in_batch")
+    result = {
+        "filename": spooled.filename,
+        "file_hash": spooled.file_hash,
+        "status": status,
+        "file_id": file_id,
+        "file_type": file_type
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def _find_existing(db: Session, hashes: List[str]) -> List[Tuple[int, str, str]]:
+    """Records already stored for any of the hashes, in one IN query"""
+    if not hashes:
+        return []
+    return db.query(FileRecord.id, FileRecord.file_hash, FileRecord.file_type).filter(
+        FileRecord.file_hash.in_(hashes)
+    ).all()
+
+
+def _find_servable(db: Session, hashes: List[str], options: ConversionOptions) -> Tuple[List[Tuple[int, str, str]], Dict[str, int]]:
+    """Records stored for the hashes that answer ``options``, and the ids of those to replace by hash"""
+    if not hashes:
+        return [], {}
+    rows = db.query(
+        FileRecord.id, FileRecord.file_hash, FileRecord.file_type,
+        cast(FileRecord.json_data["metadata"], Text)
+    ).filter(FileRecord.file_hash.in_(hashes)).all()
+
+    servable, stale = [], {}
+    for record_id, file_hash, file_type, raw_metadata in rows:
+        if options.served_by(json_codec.loads(raw_metadata) if raw_metadata else None, file_type):
+            servable.append((record_id, file_hash, file_type))
+        else:
+            stale[file_hash] = record_id
+    return servable, stale
+
+
+def _replace(db: Session, file_processor, spooled: SpooledUpload, duplicates: List[SpooledUpload], record_id: int,
+             file_type: str, json_data: Dict[str, Any], chunks: SpooledChunks, options: ConversionOptions) -> List[bytes]:
+    """Replace a stored result that did not answer the request in its own transaction and return the result lines"""
+    try:
+        store_result_chunks(db, record_id, spooled.file_hash, json_data, chunks, replace=True)
+        json_data = json_codec.SerializedDict(json_data)
+        file_processor.replace_record(db, record_id, spooled.filename, spooled.file_hash, file_type, json_data, options)
+        index_record(db, record_id, json_data, replace=True)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        return [_line(_result(item, "failed", error=str(e))) for item in [spooled] + duplicates]
+    finally:
+        chunks.cleanup()
+
+    return [_line(_result(spooled, "processed", record_id, file_type))] + [
+        _line(_result(item, "duplicate_in_batch", record_id, file_type)) for item in duplicates
+    ]
+
+
+def _store(db: Session, pending: List[Tuple[SpooledUpload, FileRecord, Dict[str, Any], SpooledChunks]]) -> List[Tuple[SpooledUpload, int, str]]:
+    """Add records with their chunks and search index entries to the current transaction.
+
+    Each result is set on its record once its chunks are stored and counted.
+    Returns (upload, record id, file type) for each record, read before the
+    commit expires the records and reloading them would parse their JSON.
+    """
+    db.add_all([record for _, record, _, _ in pending])
+    db.flush()
+    for spooled, record, json_data, chunks in pending:
+        store_result_chunks(db, record.id, spooled.file_hash, json_data, chunks)
+        record.json_data = json_codec.SerializedDict(json_data)
+    index_new_records(db, [record for _, record, _, _ in pending])
+    return [(spooled, record.id, record.file_type) for spooled, record, _, _ in pending]
+
+
+def _commit(db: Session, pending: List[Tuple[SpooledUpload, FileRecord, Dict[str, Any], SpooledChunks]],
+            duplicates: Dict[str, List[SpooledUpload]]) -> List[bytes]:
+    """Insert a group of new records in one transaction and return their result lines"""
+    committed, conflicts = [], []
+
+    try:
+        stored = _store(db, pending)
+        db.commit()
+        committed = stored
+    except IntegrityError:
+        # Another request stored one of these files meanwhile; insert them one by one
+        db.rollback()
+        for spooled, record, json_data, chunks in pending:
+            try:
+                stored = _store(db, [(spooled, record, json_data, chunks)])
+                db.commit()
+                committed.extend(stored)
+            except IntegrityError:
+                db.rollback()
+                conflicts.append(spooled)
+
+    lines = []
+    for spooled, record_id, file_type in committed:
+        hash_cache.put(spooled.file_hash, record_id)
+        lines.append(_line(_result(spooled, "processed", record_id, file_type)))
+        for duplicate in duplicates.pop(spooled.file_hash, []):
+            lines.append(_line(_result(duplicate, "duplicate_in_batch", record_id, file_type)))
+
+    if conflicts:
+        existing = {file_hash: (record_id, file_type) for record_id, file_hash, file_type
+                    in _find_existing(db, [spooled.file_hash for spooled in conflicts])}
+        for spooled in conflicts:
+            record_id, file_type = existing.get(spooled.file_hash, (None, None))
+            for item in [spooled] + duplicates.pop(spooled.file_hash, []):
+                lines.append(_line(_result(item, "already_available", record_id, file_type)))
+
+    return lines
+
+
+async def stream_batch(uploads: List[SpooledUpload], rejected: List[Dict[str, Any]],
+                       file_processor, job_queue,
+                       options: Optional[ConversionOptions] = None) -> AsyncIterator[bytes]:
+    """Process a batch of spooled uploads, yielding one NDJSON result line per file as it finishes.
+
+    Archives are expanded into their members, files are deduplicated by
+    hash within the batch and against the database, new files are
+    converted in parallel by the worker pool, and their records are
+    inserted BATCH_COMMIT_SIZE at a time.
+    """
+    files: List[SpooledUpload] = []
+    futures: List[Future] = []
+    pending: List[Tuple[SpooledUpload, FileRecord, Dict[str, Any], SpooledChunks]] = []
+    db = SessionLocal()
+
+    try:
+        for result in rejected:
+            yield _line(result)
+
+        # Expand archives into their member files
+        for spooled in uploads:
+            if not is_archive(spooled.filename):
+                files.append(spooled)
+                continue
+            try:
+                files.extend(await run_in_threadpool(expand_archive, spooled))
+            except Exception as e:
+                yield _line(_result(spooled, "failed", error=f"Could not read archive: {e}"))
+            finally:
+                spooled.cleanup()
+
+        # Deduplicate inside the batch: only the first file with a given hash is converted
+        unique: Dict[str, SpooledUpload] = {}
+        duplicates: Dict[str, List[SpooledUpload]] = {}
+        for spooled in files:
+            if spooled.file_hash in unique:
+                duplicates.setdefault(spooled.file_hash, []).append(spooled)
+            else:
+                unique[spooled.file_hash] = spooled
+
+        # ...and against the database; stored results that do not answer the requested
+        # profile or pages are converted again and replaced
+        options = options or ConversionOptions()
+        existing, stale = await run_in_threadpool(_find_servable, db, list(unique), options)
+        for record_id, file_hash, file_type in existing:
+            hash_cache.put(file_hash, record_id)
+            for spooled in [unique.pop(file_hash)] + duplicates.pop(file_hash, []):
+                yield _line(_result(spooled, "already_available", record_id, file_type))
+
+        async def convert(spooled: SpooledUpload):
+            try:
+                future = job_queue.submit_conversion(spooled.path, spooled.filename, options)
+                futures.append(future)
+                file_type, json_data, stats = await asyncio.wrap_future(future)
+                metrics.observe_processing(stats)
+                return spooled, file_type, json_data, None
+            except Exception as e:
+                metrics.count_failure("limit" if isinstance(e, ConversionLimitError) else "batch")
+                return spooled, None, None, e
+
+        # Convert the new files in parallel and store them as they complete
+        for next_done in asyncio.as_completed([convert(spooled) for spooled in unique.values()]):
+            spooled, file_type, json_data, error = await next_done
+
+            if error is not None:
+                for item in [spooled] + duplicates.pop(spooled.file_hash, []):
+                    yield _line(_result(item, "failed", error=str(error)))
+                continue
+
+            chunks = take_chunks(json_data)
+            if spooled.file_hash in stale:
+                for line in await run_in_threadpool(
+                    _replace, db, file_processor, spooled, duplicates.pop(spooled.file_hash, []),
+                    stale[spooled.file_hash], file_type, json_data, chunks, options
+                ):
+                    yield line
+                continue
+
+            try:
+                record = await run_in_threadpool(
+                    file_processor.build_record, spooled.path, spooled.filename, spooled.file_hash, file_type, json_data, options
+                )
+            except BaseException:
+                chunks.cleanup()
+                raise
+            pending.append((spooled, record, json_data, chunks))
+
+            if len(pending) >= BATCH_COMMIT_SIZE:
+                lines = await run_in_threadpool(_commit, db, pending, duplicates)
+                _discard_pending(pending)
+                pending = []
+                for line in lines:
+                    yield line
+
+        if pending:
+            lines = await run_in_threadpool(_commit, db, pending, duplicates)
+            _discard_pending(pending)
+            pending = []
+            for line in lines:
+                yield line
+    finally:
+        db.close()
+        for spooled in files:
+            spooled.cleanup()
+        # A client that disconnects leaves conversions unread or still running
+        _discard_pending(pending)
+        for future in futures:
+            future.cancel()
+            future.add_done_callback(_discard_unread_chunks)
+
+
+def _discard_pending(pending: List[Tuple[SpooledUpload, FileRecord, Dict[str, Any], SpooledChunks]]):
+    for _, _, _, chunks in pending:
+        chunks.cleanup()
+
+
+def _discard_unread_chunks(future: Future):
+    """Remove the chunk spool file of a conversion whose result was never taken"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    chunks = future.result()[1].get("chunks")
+    if chunks is not None:
+        chunks.cleanup()
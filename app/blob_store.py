@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Optional
+
+# Try to import boto3 for the S3 backend, which is optional
+try:
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+# Blob store configuration
+BLOB_STORE = os.getenv("BLOB_STORE", "local")
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", "blobs")
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_PREFIX = os.getenv("S3_PREFIX", "blobs/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+
+
+class BlobStore:
+    """Content-addressed storage for original uploads, keyed by SHA-256"""
+
+    def put_file(self, key: str, file_path: str):
+        """Store a file on disk under ``key``; a no-op if the key already exists"""
+        raise NotImplementedError
+
+    def put_bytes(self, key: str, data: bytes):
+        """Store in-memory bytes under ``key``; a no-op if the key already exists"""
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        """Open a stored blob for reading"""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs stored on the local filesystem in ``ab/cd/abcd...`` shard directories"""
+
+    def __init__(self, root: str = BLOB_STORE_PATH):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def _write_atomic(self, key: str, write):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write next to the target and rename, so readers never see partial blobs
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def put_file(self, key: str, file_path: str):
+        def write(out):
+            with open(file_path, 'rb') as src:
+                shutil.copyfileobj(src, out)
+        self._write_atomic(key, write)
+
+    def put_bytes(self, key: str, data: bytes):
+        self._write_atomic(key, lambda out: out.write(data))
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), 'rb')
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def delete(self, key: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class S3BlobStore(BlobStore):
+    """Blobs stored in an S3-compatible bucket (AWS S3, MinIO, LocalStack...)"""
+
+    def __init__(self, bucket: str, prefix: str = S3_PREFIX, endpoint_url: Optional[str] = S3_ENDPOINT_URL):
+        if not BOTO3_AVAILABLE:
+            raise RuntimeError("boto3 is required for the S3 blob store")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key[:2]}/{key[2:4]}/{key}"
+
+    def put_file(self, key: str, file_path: str):
+        if not self.exists(key):
+            self.client.upload_file(file_path, self.bucket, self._key(key))
+
+    def put_bytes(self, key: str, data: bytes):
+        if not self.exists(key):
+            self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except self.client.exceptions.ClientError:
+            return False
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Return the configured blob store"""
+    global _blob_store
+    if _blob_store is None:
+        if BLOB_STORE == "s3":
+            _blob_store = S3BlobStore(S3_BUCKET)
+        else:
+            _blob_store = LocalBlobStore()
+    return _blob_store
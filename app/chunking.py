@@ -0,0 +1,247 @@
+import hashlib
+import os
+import re
+import tempfile
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from . import json_codec
+from .database import FileChunk
+from .sections import HEADING_LABELS, HEADING_PATTERN, document_item_text
+
+# Target characters per chunk, and characters repeated from the end of the previous chunk
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "2000"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+# Chunk rows inserted per statement
+CHUNK_INSERT_BATCH = int(os.getenv("CHUNK_INSERT_BATCH", "500"))
+
+if CHUNK_SIZE <= 0 or not 0 <= CHUNK_OVERLAP < CHUNK_SIZE:
+    raise ValueError("CHUNK_SIZE must be positive and CHUNK_OVERLAP smaller than CHUNK_SIZE")
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+# (text, page number, current heading) of one document item or paragraph
+Segment = Tuple[str, Optional[int], Optional[str]]
+
+
+def iter_document_segments(document) -> Iterator[Segment]:
+    """Yield the items of a DoclingDocument in reading order, with their page and heading"""
+    heading = None
+
+    for item, _ in document.iterate_items():
+        item_text = document_item_text(item, document)
+        if not item_text or not item_text.strip():
+            continue
+
+        if getattr(item, "label", None) in HEADING_LABELS:
+            heading = item_text.strip()
+        prov = getattr(item, "prov", None)
+        yield item_text.strip(), prov[0].page_no if prov else None, heading
+
+
+def iter_text_segments(text: str) -> Iterator[Segment]:
+    """Yield the paragraphs of plain text; single-line headings become the current heading"""
+    heading = None
+    start = 0
+    breaks = chain(((match.start(), match.end()) for match in PARAGRAPH_BREAK.finditer(text)), [(len(text), len(text))])
+
+    for end, next_start in breaks:
+        paragraph = text[start:end].strip()
+        start = next_start
+        if not paragraph:
+            continue
+        if "\n" not in paragraph and HEADING_PATTERN.match(paragraph):
+            heading = paragraph
+        yield paragraph, None, heading
+
+
+def _split(text: str, size: int) -> Iterator[str]:
+    """Pieces of at most ``size`` characters, cut at whitespace where possible"""
+    while len(text) > size:
+        cut = text.rfind(" ", 0, size)
+        if cut <= 0:
+            cut = size
+        yield text[:cut]
+        text = text[cut:].lstrip()
+    if text:
+        yield text
+
+
+def _tail(text: str, overlap: int) -> str:
+    """The last ``overlap`` characters of a chunk, starting at a word boundary"""
+    if overlap <= 0 or len(text) <= overlap:
+        return text if overlap > 0 else ""
+    tail = text[-overlap:]
+    space = tail.find(" ")
+    return tail[space + 1:] if space != -1 else tail
+
+
+def iter_chunks(segments: Iterable[Segment], size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> Iterator[Dict[str, Any]]:
+    """Group segments into chunks of about ``size`` characters.
+
+    Each chunk starts with the last ``overlap`` characters of the previous one
+    and records the pages and heading its text comes from.
+    """
+    index = 0
+    parts: List[str] = []
+    length = 0
+    pages: List[int] = []
+    heading = None
+    has_new_text = False
+
+    def build() -> Dict[str, Any]:
+        text = "\n\n".join(parts)
+        return {
+            "index": index,
+            "text": text,
+            "page_start": min(pages) if pages else None,
+            "page_end": max(pages) if pages else None,
+            "heading": heading,
+            "char_count": len(text)
+        }
+
+    for segment_text, page, segment_heading in segments:
+        # Room for the overlap and the separator, so a piece always fits a new chunk
+        for piece in _split(segment_text, max(size - overlap - 2, 1)):
+            if has_new_text and length + len(piece) + 2 > size:
+                chunk = build()
+                yield chunk
+                index += 1
+                tail = _tail(chunk["text"], overlap)
+                parts, length = ([tail], len(tail)) if tail else ([], 0)
+                pages = [chunk["page_end"]] if tail and chunk["page_end"] is not None else []
+                has_new_text = False
+
+            if not has_new_text:
+                heading = segment_heading
+            parts.append(piece)
+            length += len(piece) + 2
+            if page is not None:
+                pages.append(page)
+            has_new_text = True
+
+    if has_new_text:
+        yield build()
+
+
+class ConversionChunks:
+    """The chunks of a conversion, produced on demand while they are stored.
+
+    Docling structure is followed when the document yields at least one
+    chunk, else the text; the first chunk is peeked at to decide.
+    """
+
+    def __init__(self, conversion, text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP):
+        document = getattr(conversion, "document", None)
+        self.document = document if document is not None and hasattr(document, "iterate_items") else None
+        self.text = text
+        self.size = size
+        self.overlap = overlap
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self.document is not None:
+            first = None
+            try:
+                chunks = iter_chunks(iter_document_segments(self.document), self.size, self.overlap)
+                first = next(chunks, None)
+            except Exception as e:
+                print(f"Warning: Docling chunking failed: {e}")
+            if first is not None:
+                yield first
+                yield from chunks
+                return
+        yield from iter_chunks(iter_text_segments(self.text), self.size, self.overlap)
+
+    def cleanup(self):
+        pass
+
+
+class SpooledChunks:
+    """Chunks written one per line to a JSON-lines file, read back one at a time.
+
+    Lets a worker process hand its chunks to the parent without either of
+    them holding all the chunk texts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "rb") as f:
+            for line in f:
+                yield json_codec.loads(line)
+
+    def cleanup(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def chunk_conversion(conversion, text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> ConversionChunks:
+    """Chunks following the Docling document structure when available, else the text"""
+    return ConversionChunks(conversion, text, size, overlap)
+
+
+def spool_chunks(chunks: Iterable[Dict[str, Any]], directory: Optional[str] = None) -> SpooledChunks:
+    """Write chunks to a spool file as they are produced"""
+    fd, path = tempfile.mkstemp(suffix=".chunks", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(json_codec.dumps_bytes(chunk) + b"\n")
+    except BaseException:
+        os.remove(path)
+        raise
+    return SpooledChunks(path)
+
+
+def take_chunks(json_data: Dict[str, Any]) -> Union[ConversionChunks, SpooledChunks]:
+    """Remove the chunks from a result before it is stored; they get their own rows"""
+    chunks = json_data.pop("chunks", None)
+    return chunks if chunks is not None else ConversionChunks(None, "")
+
+
+def chunk_id(file_hash: str, chunk: Dict[str, Any]) -> str:
+    """Stable id: the same file chunked with the same settings always gets the same ids"""
+    digest = hashlib.sha256(f"{file_hash}\0{chunk['index']}\0{chunk['text']}".encode())
+    return digest.hexdigest()[:32]
+
+
+def store_chunks(db: Session, file_id: int, file_hash: str, chunks: Iterable[Dict[str, Any]], replace: bool = False) -> int:
+    """Insert the chunks of a stored record in the caller's transaction, a batch at a time.
+
+    Returns the number of chunks inserted.
+    """
+    if replace:
+        db.query(FileChunk).filter(FileChunk.file_id == file_id).delete(synchronize_session=False)
+
+    rows = ({
+        "file_id": file_id,
+        "chunk_index": chunk["index"],
+        "chunk_id": chunk_id(file_hash, chunk),
+        "page_start": chunk.get("page_start"),
+        "page_end": chunk.get("page_end"),
+        "heading": chunk.get("heading"),
+        "content": chunk["text"]
+    } for chunk in chunks)
+
+    count = 0
+    while True:
+        batch = list(islice(rows, CHUNK_INSERT_BATCH))
+        if not batch:
+            break
+        db.execute(insert(FileChunk), batch)
+        count += len(batch)
+    return count
+
+
+def store_result_chunks(db: Session, file_id: int, file_hash: str, json_data: Dict[str, Any],
+                        chunks: Iterable[Dict[str, Any]], replace: bool = False):
+    """Store a result's chunks and record in its metadata how many were inserted.
+
+    There is no separate counting pass, so the result can only be encoded, and
+    written to its row, after its chunks.
+    """
+    json_data.setdefault("metadata", {})["chunk_count"] = store_chunks(db, file_id, file_hash, chunks, replace=replace)
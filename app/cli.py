@@ -0,0 +1,141 @@
+"""
+Maintenance commands for the Docling File Processor
+
+Usage:
+    python -m app.cli migrate [--batch-size 500]
+    python -m app.cli backfill-blobs [--batch-size 100]
+    python -m app.cli index-search [--batch-size 100] [--rebuild]
+    python -m app.cli reprocess [--batch-size 10] [--workers 2] [--reconvert] [--dry-run]
+"""
+
+import argparse
+
+from . import reprocess as reprocessing, search
+from .blob_store import get_blob_store
+from .database import SessionLocal, FileRecord, init_db, upgrade_schema
+
+
+def migrate(batch_size: int):
+    """Bring the existing tables up to date with the models, then create the missing ones"""
+    applied = upgrade_schema(batch_size)
+    init_db()
+    print(f"✅ Migration complete: {applied} change(s) applied")
+
+
+def backfill_blobs(batch_size: int):
+    """Move file_content of existing rows into the blob store, one batch at a time"""
+    store = get_blob_store()
+    db = SessionLocal()
+    last_id = 0
+    moved = 0
+
+    try:
+        while True:
+            # Only ids and hashes here; each blob is loaded on its own below
+            batch = db.query(FileRecord.id, FileRecord.file_hash).filter(
+                FileRecord.id > last_id,
+                FileRecord.blob_key.is_(None),
+                FileRecord.file_content.isnot(None)
+            ).order_by(FileRecord.id).limit(batch_size).all()
+
+            if not batch:
+                break
+
+            for record_id, file_hash in batch:
+                file_content = db.query(FileRecord.file_content).filter(FileRecord.id == record_id).scalar()
+                store.put_bytes(file_hash, file_content)
+                db.query(FileRecord).filter(FileRecord.id == record_id).update(
+                    {FileRecord.blob_key: file_hash, FileRecord.file_content: None},
+                    synchronize_session=False
+                )
+                last_id = record_id
+
+            db.commit()
+            moved += len(batch)
+            print(f"Moved {moved} file(s) to the blob store")
+    finally:
+        db.close()
+
+    print(f"✅ Backfill complete: {moved} file(s) moved")
+
+
+def index_search(batch_size: int, rebuild: bool):
+    """Add existing rows to the search index, one batch per transaction"""
+    if not search.full_text_available():
+        print("Full-text index is not available on this database; indexing entities only")
+
+    db = SessionLocal()
+    last_id = 0
+    indexed = 0
+
+    try:
+        while True:
+            ids = [record_id for (record_id,) in db.query(FileRecord.id).filter(
+                FileRecord.id > last_id
+            ).order_by(FileRecord.id).limit(batch_size)]
+
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            if not rebuild:
+                done = search.indexed_ids(db, ids)
+                ids = [record_id for record_id in ids if record_id not in done]
+
+            search.index_records(db, ids)
+            db.commit()
+            indexed += len(ids)
+            print(f"Indexed {indexed} file(s)")
+    finally:
+        db.close()
+
+    print(f"✅ Search index complete: {indexed} file(s) indexed")
+
+
+def reprocess(batch_size: int, workers: int, reconvert: bool, dry_run: bool):
+    """Bring stored results up to date with the current extraction code and conversion settings"""
+    totals = reprocessing.reprocess(batch_size, workers, reconvert, dry_run)
+
+    if dry_run:
+        print(f"{totals['converted']} file(s) to convert again, {totals['derived']} to refresh from their cached conversion")
+        return
+    print(f"✅ Reprocessing complete: {totals['converted']} converted, {totals['derived']} refreshed "
+          f"from cached conversions, {totals['skipped']} skipped (over the page limit), {totals['failed']} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Docling File Processor maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = subparsers.add_parser("migrate", help="Add the columns, indexes and column types the existing tables are missing")
+    upgrade.add_argument("--batch-size", type=int, default=500, help="Rows per transaction when converting columns")
+
+    backfill = subparsers.add_parser("backfill-blobs", help="Move stored file contents into the blob store")
+    backfill.add_argument("--batch-size", type=int, default=100, help="Rows per transaction")
+
+    index = subparsers.add_parser("index-search", help="Add stored files to the full-text and entity search index")
+    index.add_argument("--batch-size", type=int, default=100, help="Rows per transaction")
+    index.add_argument("--rebuild", action="store_true", help="Re-index files that are already indexed")
+
+    redo = subparsers.add_parser("reprocess", help="Recompute stale results, converting files again only when needed")
+    redo.add_argument("--batch-size", type=int, default=10, help="Rows checked per query")
+    redo.add_argument("--workers", type=int, default=reprocessing.REPROCESS_WORKERS, help="Worker processes")
+    redo.add_argument("--reconvert", action="store_true", help="Convert every file again, even with a cached conversion")
+    redo.add_argument("--dry-run", action="store_true", help="Only count the stale files")
+
+    args = parser.parse_args()
+    if args.command == "migrate":
+        migrate(args.batch_size)
+        return
+    init_db()
+
+    if args.command == "backfill-blobs":
+        backfill_blobs(args.batch_size)
+    elif args.command == "index-search":
+        index_search(args.batch_size, args.rebuild)
+    elif args.command == "reprocess":
+        reprocess(args.batch_size, args.workers, args.reconvert, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Versioning of stored results and the cache of converted documents
+
+A result has two layers. The conversion is the Docling document and text of a
+file; it is expensive and only changes with the conversion settings. The
+derived layer (entities, sections, statistics, chunks, search index) is
+computed from the conversion and changes with the extraction code.
+
+Conversions are cached in the blob store under their ``conversion_key``, so
+``python -m app.cli reprocess`` can recompute stale derived layers without
+converting the files again.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from . import json_codec
+from .blob_store import BlobStore
+from .chunking import CHUNK_OVERLAP, CHUNK_SIZE
+from .native_formats import NativeConversion, native_format
+from .pipeline_profiles import ConversionOptions
+
+# Bump when native handlers or Docling pipeline settings change what conversions produce
+CONVERSION_VERSION = 1
+# Bump when entity, section, statistics or chunk extraction changes
+EXTRACTOR_VERSION = 4
+
+
+def extractor_version() -> str:
+    """Version of the derived layer, including the chunk settings in effect"""
+    return f"{EXTRACTOR_VERSION}.chunks-{CHUNK_SIZE}-{CHUNK_OVERLAP}"
+
+
+def conversion_key(file_hash: str, file_type: str, filename: str, options: Optional[ConversionOptions] = None) -> str:
+    """Key of the conversion of a file with the current settings; it changes when they do"""
+    options = (options or ConversionOptions()).for_file_type(file_type)
+    page_range = options.to_metadata().get("page_range")
+    settings = [
+        file_hash,
+        str(CONVERSION_VERSION),
+        native_format(file_type, filename) or "docling",
+        options.profile,
+        json_codec.dumps(page_range)
+    ]
+    return hashlib.sha256("\0".join(settings).encode()).hexdigest()
+
+
+def cacheable(json_data: Dict[str, Any]) -> bool:
+    """Whether a result comes from a successful conversion; fallbacks are never cached"""
+    docling_data = json_data.get("docling_extraction")
+    return (
+        (json_data.get("metadata") or {}).get("extraction_method") not in (None, "fallback")
+        and isinstance(docling_data, dict)
+        and "error" not in docling_data
+    )
+
+
+def store_conversion(blob_store: BlobStore, key: str, json_data: Dict[str, Any]):
+    """Cache the conversion layer of a result: its Docling document and text"""
+    blob_store.put_bytes(key, json_codec.dumps_bytes({
+        "extraction_method": json_data["metadata"]["extraction_method"],
+        "text": json_data["full_text"],
+        "document": json_data["docling_extraction"]
+    }))
+
+
+def load_conversion(blob_store: BlobStore, key: str) -> Optional[Dict[str, Any]]:
+    """A cached conversion as ``{"conversion", "text", "document", "extraction_method"}``, or None.
+
+    ``conversion`` is rebuilt as a DoclingDocument wrapper, so sections and
+    chunks follow the document structure as they did after the conversion.
+    """
+    from docling_core.types.doc import DoclingDocument
+
+    if not blob_store.exists(key):
+        return None
+    with blob_store.open(key) as f:
+        cached = json_codec.loads(f.read())
+
+    try:
+        document = DoclingDocument.model_validate(cached["document"])
+    except Exception as e:
+        print(f"Warning: Cached conversion {key} is not a valid Docling document: {e}")
+        return None
+
+    cached["conversion"] = NativeConversion(document, cached["text"])
+    return cached
@@ -0,0 +1,171 @@
+import gc
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+# Docling is imported when the first converter is built, so importing the app stays fast
+if TYPE_CHECKING:
+    from docling.document_converter import DocumentConverter
+
+# Converter pool configuration
+CONVERTER_POOL_SIZE = int(os.getenv("CONVERTER_POOL_SIZE", "1"))
+CONVERTER_MAX_USES = int(os.getenv("CONVERTER_MAX_USES", "500"))
+CONVERTER_MAX_RSS_GROWTH_MB = int(os.getenv("CONVERTER_MAX_RSS_GROWTH_MB", "2048"))
+CONVERTER_WARMUP_FORMATS = os.getenv("CONVERTER_WARMUP_FORMATS", "pdf,docx,pptx")
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process, or 0 when it cannot be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def default_converter() -> "DocumentConverter":
+    """A DocumentConverter with Docling defaults for every format"""
+    from docling.document_converter import DocumentConverter
+
+    return DocumentConverter()
+
+
+class _PooledConverter:
+    """A DocumentConverter together with its usage counter"""
+
+    def __init__(self, converter: "DocumentConverter"):
+        self.converter = converter
+        self.uses = 0
+
+
+class ConverterPool:
+    """Fixed-size pool of pre-warmed DocumentConverter instances.
+
+    Instances are handed out one request at a time and replaced in the
+    background after ``max_uses`` conversions or when the process RSS has
+    grown by more than ``max_rss_growth_mb`` since the last warm-up.
+    """
+
+    def __init__(
+        self,
+        size: int = CONVERTER_POOL_SIZE,
+        max_uses: int = CONVERTER_MAX_USES,
+        max_rss_growth_mb: int = CONVERTER_MAX_RSS_GROWTH_MB,
+        warmup_formats: Optional[List[str]] = None,
+        factory: Optional[Callable[[], "DocumentConverter"]] = None
+    ):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_rss_growth = max_rss_growth_mb * 1024 * 1024
+        self.warmup_formats = warmup_formats if warmup_formats is not None else [
+            fmt.strip() for fmt in CONVERTER_WARMUP_FORMATS.split(",") if fmt.strip()
+        ]
+        self.factory = factory or default_converter
+        self._available: "queue.Queue[_PooledConverter]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._baseline_rss = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once every instance has been built and warmed up"""
+        return self._ready.is_set()
+
+    def _build(self) -> _PooledConverter:
+        """Create a converter and initialize the pipelines we expect to use"""
+        from docling.datamodel.base_models import InputFormat
+
+        converter = self.factory()
+        for fmt in self.warmup_formats:
+            try:
+                converter.initialize_pipeline(InputFormat(fmt))
+            except Exception as e:
+                print(f"Warning: Could not warm up Docling pipeline for {fmt}: {e}")
+        return _PooledConverter(converter)
+
+    def warm_up(self):
+        """Build all instances up front so no request pays the initialization cost"""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    break
+                self._created += 1
+            self._available.put(self._build())
+
+        self._baseline_rss = current_rss_bytes()
+        self._ready.set()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a converter for the duration of one conversion"""
+        pooled = self._checkout(timeout)
+        try:
+            yield pooled.converter
+        finally:
+            self._checkin(pooled)
+
+    def _checkout(self, timeout: Optional[float]) -> _PooledConverter:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            try:
+                return self._available.get_nowait()
+            except queue.Empty:
+                pass
+
+            # Not warmed up yet, or an instance was dropped: build up to the pool size
+            with self._lock:
+                build = self._created < self.size
+                if build:
+                    self._created += 1
+            if build:
+                try:
+                    return self._build()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+            wait = 1.0 if deadline is None else min(1.0, deadline - time.monotonic())
+            if wait <= 0:
+                raise TimeoutError("No Docling converter became available")
+            try:
+                return self._available.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def _checkin(self, pooled: _PooledConverter):
+        pooled.uses += 1
+
+        if not self._should_recycle(pooled):
+            self._available.put(pooled)
+            return
+
+        # Replace the instance off the request path
+        threading.Thread(target=self._replace, daemon=True).start()
+
+    def _should_recycle(self, pooled: _PooledConverter) -> bool:
+        if self.max_uses and pooled.uses >= self.max_uses:
+            return True
+
+        if self.max_rss_growth and self._baseline_rss:
+            return current_rss_bytes() - self._baseline_rss > self.max_rss_growth
+
+        return False
+
+    def _replace(self):
+        gc.collect()
+        try:
+            replacement = self._build()
+        except Exception as e:
+            print(f"Warning: Could not rebuild Docling converter: {e}")
+            with self._lock:
+                self._created -= 1
+            return
+
+        self._baseline_rss = current_rss_bytes()
+        self._available.put(replacement)
@@ -1,10 +1,17 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, LargeBinary
+from sqlalchemy import create_engine, inspect, text, Column, Index, Integer, String, Table, Text, DateTime, LargeBinary, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, deferred
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.sql import func
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+import json
 import os
 import urllib.parse
 from dotenv import load_dotenv
+from . import json_codec
 
 load_dotenv()
 
@@ -30,10 +37,36 @@ if not DATABASE_URL:
         # Construct database URL from separate components
         DATABASE_URL = f"postgresql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Debug: Print the database URL being used (remove this in production)
-print(f"🔗 Using database URL: {DATABASE_URL}")
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
 
-engine = create_engine(DATABASE_URL)
+def _json_serializer(obj) -> str:
+    """Serialize JSON columns, keeping non-ASCII text readable"""
+    return json_codec.dumps(obj)
+
+# Connection pool configuration (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+def _engine_options() -> dict:
+    options = {"json_serializer": _json_serializer, "json_deserializer": json_codec.loads}
+    if not DATABASE_URL.startswith("sqlite"):
+        # Pre-ping and recycle drop connections the remote server or a proxy closed
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING
+        )
+    return options
+
+# Creating the engine does not connect; the first query does
+engine = create_engine(DATABASE_URL, **_engine_options())
+print(f"🔗 Using database URL: {engine.url.render_as_string(hide_password=True)}")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -43,12 +76,80 @@ class FileRecord(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, index=True)
     file_hash = Column(String, unique=True, index=True)
-    file_content = Column(LargeBinary)
-    json_data = Column(Text)
+    # Original bytes live in the blob store under blob_key; file_content is only
+    # kept for rows not yet moved by `python -m app.cli backfill-blobs`
+    blob_key = Column(String)
+    file_content = deferred(Column(LargeBinary))
+    # JSONB on PostgreSQL so single keys can be read server-side; JSON text elsewhere
+    json_data = Column(JSON().with_variant(JSONB(), "postgresql"))
     file_type = Column(String)
+    # Version of the derived layer of json_data, and blob key of the cached conversion
+    # it was derived from (app.conversion_cache); rows stored before have neither
+    extractor_version = Column(String)
+    conversion_key = Column(String(64))
+    # Set in Python so the stored value has the format /files/ cursors are bound in;
+    # SQLite's CURRENT_TIMESTAMP text would compare unequal to the same instant
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        # Keyset pagination of /files/, optionally filtered by type
+        Index("ix_file_records_created_at_id", "created_at", "id"),
+        Index("ix_file_records_file_type_created_at_id", "file_type", "created_at", "id"),
+        # Filename prefix search (LIKE 'abc%') regardless of the database collation
+        Index("ix_file_records_filename_pattern", "filename", postgresql_ops={"filename": "text_pattern_ops"}),
+    )
+
+class IngestJob(Base):
+    __tablename__ = "ingest_jobs"
+    
+    id = Column(String, primary_key=True)
+    filename = Column(String)
+    spool_path = Column(String)
+    status = Column(String, index=True, default="queued")
+    file_record_id = Column(Integer)
+    # ConversionOptions.to_dict() of the request: pipeline profile and pages
+    options = Column(JSON)
+    result_status = Column(String)
+    error = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class FileEntity(Base):
+    __tablename__ = "file_entities"
+    
+    # One row per distinct entity of a file, written by app.search with the record
+    id = Column(Integer, primary_key=True)
+    file_id = Column(Integer, nullable=False, index=True)
+    entity_type = Column(String, nullable=False)
+    value = Column(Text, nullable=False)
+    # Lowercased and truncated value that lookups match on
+    normalized_value = Column(String(255), nullable=False)
+    occurrences = Column(Integer, nullable=False, default=1)
+    
+    __table_args__ = (
+        Index("ix_file_entities_lookup", "normalized_value", "entity_type"),
+        Index("ix_file_entities_type_file_id", "entity_type", "file_id"),
+    )
+
+class FileChunk(Base):
+    __tablename__ = "file_chunks"
+    
+    # Pieces of a file's text for paging and RAG ingestion, written by app.chunking
+    id = Column(Integer, primary_key=True)
+    file_id = Column(Integer, nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    chunk_id = Column(String(32), nullable=False, index=True)
+    page_start = Column(Integer)
+    page_end = Column(Integer)
+    heading = Column(Text)
+    content = Column(Text, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_file_chunks_file_id_chunk_index", "file_id", "chunk_index", unique=True),
+        Index("ix_file_chunks_file_id_page", "file_id", "page_start", "page_end"),
+    )
+
 def get_db():
     db = SessionLocal()
     try:
@@ -56,5 +157,174 @@ def get_db():
     finally:
         db.close()
 
+def pool_status() -> dict:
+    """Current connection pool usage, for monitoring"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    if not DATABASE_URL.startswith("sqlite"):
+        status["max_overflow"] = DB_MAX_OVERFLOW
+        status["timeout"] = DB_POOL_TIMEOUT
+    return status
+
+def database_reachable() -> bool:
+    """Whether a connection can be made and answers a trivial query"""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        print(f"Warning: Database is not reachable: {e}")
+        return False
+
+# PostgreSQL advisory lock keys: table creation at startup, and migrations. They differ
+# so processes starting while a migration runs are not held up by it
+_CREATE_LOCK_KEY = 7316425890
+_MIGRATE_LOCK_KEY = 7316425891
+
+@contextmanager
+def _schema_lock(key: int):
+    """Hold a PostgreSQL advisory lock, so concurrent processes apply schema changes one at a time"""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+def schema_changes() -> List[Tuple[str, Table, Any]]:
+    """Columns, JSONB conversions and indexes the existing tables are missing, as (kind, table, item)"""
+    inspector = inspect(engine)
+    changes = []
+    
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                changes.append(("column", table, column))
+            elif (
+                engine.dialect.name == "postgresql"
+                and isinstance(column.type, JSON)
+                and not isinstance(existing[column.name], JSON)
+            ):
+                changes.append(("jsonb", table, column))
+        
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        changes.extend(("index", table, index) for index in table.indexes if index.name not in indexes)
+    
+    return changes
+
+def _jsonb_value(value: Optional[str]) -> Optional[str]:
+    """A JSON document stored as text, re-encoded so PostgreSQL accepts it as JSONB.
+    
+    json.dumps wrote NaN and Infinity, which are not JSON; they become null.
+    """
+    if value is None:
+        return None
+    return json_codec.dumps(json.loads(value, parse_constant=lambda constant: None))
+
+def _copy_json_rows(conn, table: Table, column: Column, shadow: str, rows):
+    for record_id, value in rows:
+        try:
+            document = _jsonb_value(value)
+        except ValueError as e:
+            raise ValueError(f"{table.name}.{column.name} of row {record_id} is not valid JSON: {e}")
+        conn.execute(
+            text(f"UPDATE {table.name} SET {shadow} = CAST(:document AS JSONB) WHERE id = :id"),
+            {"document": document, "id": record_id}
+        )
+
+def _convert_to_jsonb(table: Table, column: Column, batch_size: int):
+    """Move a text column holding JSON documents to JSONB without locking the table while rows are copied.
+    
+    Documents are copied into a new column one batch per transaction, then
+    the columns are swapped under a short exclusive lock, after copying the
+    rows written in the meantime again.
+    """
+    shadow = f"{column.name}_jsonb"
+    with engine.begin() as conn:
+        started = conn.execute(text("SELECT now()")).scalar()
+        conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {shadow} JSONB"))
+    
+    last_id, copied = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(f"SELECT id, {column.name} FROM {table.name} WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": batch_size}
+            ).all()
+            if not rows:
+                break
+            _copy_json_rows(conn, table, column, shadow, rows)
+        last_id = rows[-1][0]
+        copied += len(rows)
+        print(f"Copied {copied} row(s) of {table.name}.{column.name} to JSONB")
+    
+    with engine.begin() as conn:
+        conn.execute(text(f"LOCK TABLE {table.name} IN ACCESS EXCLUSIVE MODE"))
+        changed = " OR updated_at >= :started" if "updated_at" in table.columns else ""
+        rows = conn.execute(
+            text(f"SELECT id, {column.name} FROM {table.name} WHERE ({shadow} IS NULL AND {column.name} IS NOT NULL){changed}"),
+            {"started": started}
+        ).all()
+        _copy_json_rows(conn, table, column, shadow, rows)
+        conn.execute(text(f"ALTER TABLE {table.name} DROP COLUMN {column.name}"))
+        conn.execute(text(f"ALTER TABLE {table.name} RENAME COLUMN {shadow} TO {column.name}"))
+
+def _create_index(index: Index):
+    """Create an index; on PostgreSQL concurrently, so writes continue while it is built"""
+    if engine.dialect.name != "postgresql":
+        index.create(bind=engine, checkfirst=True)
+        return
+    
+    options = index.dialect_options["postgresql"]
+    options["concurrently"] = True
+    try:
+        statement = CreateIndex(index, if_not_exists=True)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(statement)
+    finally:
+        options["concurrently"] = False
+
+def upgrade_schema(batch_size: int = 500) -> int:
+    """Apply the changes listed by schema_changes(); returns how many were applied.
+    
+    Run with ``python -m app.cli migrate`` before starting a version that needs them.
+    """
+    with _schema_lock(_MIGRATE_LOCK_KEY):
+        # Listed under the lock, so a concurrent run that finished first is not repeated
+        changes = schema_changes()
+        for kind, table, item in changes:
+            print(f"Applying {kind} {table.name}.{item.name}")
+            if kind == "column":
+                column_type = item.type.compile(dialect=engine.dialect)
+                exists = " IF NOT EXISTS" if engine.dialect.name == "postgresql" else ""
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN{exists} {item.name} {column_type}"))
+            elif kind == "jsonb":
+                _convert_to_jsonb(table, item, batch_size)
+            else:
+                _create_index(item)
+    return len(changes)
+
 def init_db():
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    """Create missing tables; changes to existing tables are left to ``python -m app.cli migrate``"""
+    from .search import init_search_index
+    
+    with _schema_lock(_CREATE_LOCK_KEY):
+        Base.metadata.create_all(bind=engine)
+        init_search_index()
+    
+    changes = schema_changes()
+    if changes:
+        pending = ", ".join(f"{kind} {table.name}.{item.name}" for kind, table, item in changes)
+        print(f"Warning: Database schema is out of date ({pending}). Run `python -m app.cli migrate`.")
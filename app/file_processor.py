@@ -1,12 +1,25 @@
+import asyncio
 import hashlib
-import json
 import os
-import re
-import tempfile
-from typing import Dict, Any, Optional, List
-from docling.document_converter import DocumentConverter
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from sqlalchemy import Text, cast
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from . import json_codec, metrics
+from .blob_store import BlobStore, get_blob_store
+from .chunking import chunk_conversion, store_result_chunks, take_chunks
+from .conversion_cache import cacheable, conversion_key, extractor_version, store_conversion
+from .converter_pool import ConverterPool
 from .database import FileRecord
+from .entities import entity_extractor
+from .hash_cache import hash_cache
+from .isolation import ConversionLimitError, check_page_limit, pdf_page_count
+from .native_formats import NATIVE_HANDLERS, native_format
+from .pipeline_profiles import DEFAULT_PROFILE, PIPELINE_PROFILES, ConversionOptions, warmup_profiles
+from .search import index_record
+from .sections import iter_sections, iter_sections_from_document
 
 # Try to import magic, with fallback for Windows
 try:
@@ -17,19 +30,63 @@ except ImportError:
     print("Warning: python-magic not available. Using file extension fallback.")
 
 class FileProcessor:
-    def __init__(self):
-        # Initialize DocumentConverter with default settings
-        self.docling_converter = DocumentConverter()
+    def __init__(self, converter_pool: Optional[ConverterPool] = None, blob_store: Optional[BlobStore] = None):
+        # Pool of DocumentConverter instances with default settings
+        self.converter_pool = converter_pool or ConverterPool()
+        # One pool per pipeline profile, the others created on first use
+        self.converter_pools: Dict[str, ConverterPool] = {DEFAULT_PROFILE: self.converter_pool}
+        self._pools_lock = threading.Lock()
+        # Content-addressed storage for the original files
+        self.blob_store = blob_store or get_blob_store()
+        # Set to JobQueue.submit_upload_conversion to run conversions in isolated worker
+        # processes; returns a future of (file_type, json_data, metrics)
+        self.conversion_runner: Optional[Callable[..., Future]] = None
+    
+    def get_converter_pool(self, profile: str = DEFAULT_PROFILE) -> ConverterPool:
+        """Converter pool for a pipeline profile, sized like the default pool"""
+        with self._pools_lock:
+            pool = self.converter_pools.get(profile)
+            if pool is None:
+                pool = ConverterPool(
+                    size=self.converter_pool.size,
+                    warmup_formats=["pdf"],
+                    factory=PIPELINE_PROFILES[profile]
+                )
+                self.converter_pools[profile] = pool
+            return pool
+    
+    @property
+    def ready(self) -> bool:
+        """True once the converters of PIPELINE_PROFILES_WARMUP are built"""
+        return all(self.get_converter_pool(profile).ready for profile in warmup_profiles())
+    
+    def warm_up(self, profiles: Optional[List[str]] = None):
+        """Build the converters of the given profiles, PIPELINE_PROFILES_WARMUP by default"""
+        for profile in profiles if profiles is not None else warmup_profiles():
+            self.get_converter_pool(profile).warm_up()
         
     def calculate_file_hash(self, file_content: bytes) -> str:
         """Calculate SHA-256 hash of file content"""
         return hashlib.sha256(file_content).hexdigest()
     
-    def detect_file_type(self, file_content: bytes, filename: str) -> str:
+    def calculate_file_hash_from_path(self, file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """Calculate SHA-256 hash of a file on disk without loading it whole"""
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+    
+    def _read_head(self, file_path: str, size: int = 8192) -> bytes:
+        """Read the first bytes of a file, enough for type detection"""
+        with open(file_path, 'rb') as f:
+            return f.read(size)
+    
+    def detect_file_type(self, file_head: bytes, filename: str) -> str:
         """Detect file type using python-magic or file extension fallback"""
         if MAGIC_AVAILABLE:
             try:
-                mime_type = magic.from_buffer(file_content, mime=True)
+                mime_type = magic.from_buffer(file_head, mime=True)
                 
                 # Map MIME types to file extensions
                 mime_to_ext = {
@@ -67,218 +124,170 @@ class FileProcessor:
             return extension_map.get(ext, ext)
         return 'unknown'
     
-    def extract_text_from_file(self, file_content: bytes, file_type: str, filename: str) -> str:
+    def _convert_with_docling(self, file_path: str, options: Optional[ConversionOptions] = None):
+        """Run a single Docling conversion and return the ConversionResult"""
+        options = options or ConversionOptions()
+        if self._read_head(file_path, 5) == b"%PDF-":
+            check_page_limit(pdf_page_count(file_path), options.page_range)
+        with self.get_converter_pool(options.profile).acquire() as converter:
+            return converter.convert(file_path, **options.convert_kwargs())
+    
+    def _export_text(self, result) -> str:
+        """Export text from a ConversionResult"""
+        if hasattr(result, 'document') and hasattr(result.document, 'export_to_markdown'):
+            # Export to markdown format for text extraction
+            return result.document.export_to_markdown()
+        elif hasattr(result, 'document') and hasattr(result.document, 'export_to_text'):
+            # If text export is available
+            return result.document.export_to_text()
+        elif hasattr(result, 'document'):
+            # Fallback: try to get text from document structure
+            return str(result.document)
+        else:
+            # Ultimate fallback
+            return str(result)
+    
+    def _export_structure(self, result) -> Dict[str, Any]:
+        """Export structured data from a ConversionResult"""
+        if hasattr(result, 'document'):
+            # Convert document to dict if possible
+            try:
+                return result.document.model_dump() if hasattr(result.document, 'model_dump') else result.document.__dict__
+            except:
+                return {"raw_document": str(result.document)}
+        return {"raw_result": str(result)}
+    
+    def _decode_text(self, file_path: str) -> str:
+        """Read a file as text, used when Docling is not needed or fails"""
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read()
+        except Exception:
+            return ""
+    
+    def extract_text_from_file(self, file_path: str, file_type: str, filename: str) -> str:
         """Extract text from file using Docling DocumentConverter"""
         try:
             # For plain text files, try to decode directly first
             if file_type in ['txt', 'csv', 'md']:
-                try:
-                    text_content = file_content.decode('utf-8', errors='ignore')
-                    if text_content.strip():
-                        return text_content
-                except:
-                    pass
+                text_content = self._decode_text(file_path)
+                if text_content.strip():
+                    return text_content
             
             # For binary files or if direct decoding fails, use Docling
-            # Create a temporary file for Docling to process
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_type}') as temp_file:
-                temp_file.write(file_content)
-                temp_path = temp_file.name
-            
-            try:
-                # Use Docling DocumentConverter to convert the file
-                result = self.docling_converter.convert(temp_path)
-                
-                # Extract text from the DoclingDocument
-                if hasattr(result, 'document') and hasattr(result.document, 'export_to_markdown'):
-                    # Export to markdown format for text extraction
-                    return result.document.export_to_markdown()
-                elif hasattr(result, 'document') and hasattr(result.document, 'export_to_text'):
-                    # If text export is available
-                    return result.document.export_to_text()
-                elif hasattr(result, 'document'):
-                    # Fallback: try to get text from document structure
-                    return str(result.document)
-                else:
-                    # Ultimate fallback
-                    return str(result)
-                    
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            return self._export_text(self._convert_with_docling(file_path))
                     
         except Exception as e:
             print(f"Warning: Docling text extraction failed: {e}")
             # Ultimate fallback - try to decode as text
-            try:
-                return file_content.decode('utf-8', errors='ignore')
-            except:
-                return str(file_content)
+            return self._decode_text(file_path)
     
     def extract_entities_from_text(self, text: str) -> List[Dict[str, Any]]:
         """Extract entities from text using regex patterns"""
-        entities = []
-        
-        # Email addresses
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        for email in emails:
-            entities.append({
-                "type": "email",
-                "value": email,
-                "confidence": 0.9
-            })
-        
-        # Phone numbers
-        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        for phone in phones:
-            entities.append({
-                "type": "phone",
-                "value": phone,
-                "confidence": 0.8
-            })
-        
-        # URLs
-        url_pattern = r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:[\w.])*)?)?'
-        urls = re.findall(url_pattern, text)
-        for url in urls:
-            entities.append({
-                "type": "url",
-                "value": url,
-                "confidence": 0.9
-            })
-        
-        # Dates
-        date_pattern = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b'
-        dates = re.findall(date_pattern, text)
-        for date in dates:
-            entities.append({
-                "type": "date",
-                "value": date,
-                "confidence": 0.7
-            })
-        
-        # Names (simple pattern)
-        name_pattern = r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'
-        names = re.findall(name_pattern, text)
-        for name in names:
-            entities.append({
-                "type": "person",
-                "value": name,
-                "confidence": 0.6
-            })
-        
+        entities, _ = entity_extractor.extract(text)
         return entities
     
+    def _build_statistics(self, entities: List[Dict[str, Any]], entity_counts: Dict[str, int], sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summary counts. Entity counts are occurrences gathered during the entity scans,
+        as before entities were deduplicated; distinct_entities counts the deduplicated list"""
+        return {
+            "total_entities": sum(entity_counts.values()),
+            "distinct_entities": len(entities),
+            "total_sections": len(sections),
+            "email_count": entity_counts["email"],
+            "phone_count": entity_counts["phone"],
+            "url_count": entity_counts["url"],
+            "date_count": entity_counts["date"],
+            "person_count": entity_counts["person"]
+        }
+    
     def extract_sections_from_text(self, text: str) -> List[Dict[str, Any]]:
         """Extract document sections"""
-        sections = []
-        lines = text.split('\n')
-        current_section = {"title": "Main Content", "content": "", "level": 1}
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check if line is a heading
-            if re.match(r'^[A-Z][A-Z\s]+$', line) or re.match(r'^[0-9]+\.\s+[A-Z]', line):
-                # Save previous section
-                if current_section["content"]:
-                    sections.append(current_section)
-                
-                # Start new section
-                current_section = {
-                    "title": line,
-                    "content": "",
-                    "level": 2 if re.match(r'^[0-9]+\.', line) else 1
-                }
-            else:
-                current_section["content"] += line + "\n"
-        
-        # Add the last section
-        if current_section["content"]:
-            sections.append(current_section)
+        return list(iter_sections(text))
+    
+    def extract_sections(self, conversion, text: str) -> List[Dict[str, Any]]:
+        """Sections from the Docling heading hierarchy when available, else from the text"""
+        document = getattr(conversion, 'document', None)
+        if document is not None and hasattr(document, 'iterate_items'):
+            try:
+                sections = list(iter_sections_from_document(document))
+                # A document without text items (e.g. only pictures) falls back to the text
+                if sections:
+                    return sections
+            except Exception as e:
+                print(f"Warning: Docling section extraction failed: {e}")
+        return self.extract_sections_from_text(text)
+    
+    def _convert_natively(self, file_path: str, file_type: str, filename: str):
+        """Convert with a native handler when one applies; None means use Docling"""
+        fmt = native_format(file_type, filename)
+        if fmt is None:
+            return None, None
         
-        return sections
+        try:
+            with metrics.stage("native_convert"):
+                return NATIVE_HANDLERS[fmt](file_path, filename), f"native_{fmt}"
+        except MemoryError:
+            raise
+        except Exception as e:
+            print(f"Warning: Native {fmt} extraction failed, using Docling instead: {e}")
+            metrics.count_failure("native")
+            return None, None
     
-    def extract_json_with_docling(self, file_content: bytes, file_type: str, filename: str) -> Dict[str, Any]:
+    def extract_json_with_docling(self, file_path: str, file_type: str, filename: str,
+                                  options: Optional[ConversionOptions] = None) -> Dict[str, Any]:
         """Extract structured JSON data using Docling DocumentConverter"""
+        options = (options or ConversionOptions()).for_file_type(file_type)
         try:
-            # Extract text from file using Docling
-            text_content = self.extract_text_from_file(file_content, file_type, filename)
+            # Simple formats are read directly into a DoclingDocument, skipping the pipeline
+            conversion, extraction_method = self._convert_natively(file_path, file_type, filename)
             
-            # Try to get structured data from Docling as well
-            docling_data = None
-            try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_type}') as temp_file:
-                    temp_file.write(file_content)
-                    temp_path = temp_file.name
+            text_content = None
+            if conversion is not None:
+                with metrics.stage("export_structure"):
+                    docling_data = self._export_structure(conversion)
+                text_content = conversion.text
+            else:
+                extraction_method = "docling_document_converter"
                 
+                # For plain text files the text is taken from the bytes directly
+                if file_type in ['txt', 'csv', 'md']:
+                    text_content = self._decode_text(file_path)
+                    if not text_content.strip():
+                        text_content = None
+                
+                # Convert once; text and structure are both exported from the same result
                 try:
-                    # Convert using Docling
-                    result = self.docling_converter.convert(temp_path)
-                    
-                    # Try to extract structured data
-                    if hasattr(result, 'document'):
-                        # Convert document to dict if possible
-                        try:
-                            docling_data = result.document.model_dump() if hasattr(result.document, 'model_dump') else result.document.__dict__
-                        except:
-                            docling_data = {"raw_document": str(result.document)}
-                    else:
-                        docling_data = {"raw_result": str(result)}
-                        
-                finally:
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                        
-            except Exception as e:
-                print(f"Warning: Docling structured extraction failed: {e}")
-                docling_data = {"error": str(e)}
-            
-            # Extract additional entities and sections
-            entities = self.extract_entities_from_text(text_content)
-            sections = self.extract_sections_from_text(text_content)
+                    with metrics.stage("docling_convert"):
+                        conversion = self._convert_with_docling(file_path, options)
+                    with metrics.stage("export_structure"):
+                        docling_data = self._export_structure(conversion)
+                except (ConversionLimitError, MemoryError):
+                    raise
+                except Exception as e:
+                    print(f"Warning: Docling structured extraction failed: {e}")
+                    metrics.count_failure("docling")
+                    docling_data = {"error": str(e)}
             
-            # Create comprehensive JSON structure
-            result = {
-                "full_text": text_content,  # Include the complete text
-                "text_summary": text_content[:500] + "..." if len(text_content) > 500 else text_content,
-                "metadata": {
-                    "source": "docling_extraction",
-                    "file_type": file_type,
-                    "text_length": len(text_content),
-                    "word_count": len(text_content.split()),
-                    "line_count": len(text_content.split('\n')),
-                    "extraction_method": "docling_document_converter"
-                },
-                "entities": entities,
-                "sections": sections,
-                "docling_extraction": docling_data,
-                "statistics": {
-                    "total_entities": len(entities),
-                    "total_sections": len(sections),
-                    "email_count": len([e for e in entities if e["type"] == "email"]),
-                    "phone_count": len([e for e in entities if e["type"] == "phone"]),
-                    "url_count": len([e for e in entities if e["type"] == "url"]),
-                    "person_count": len([e for e in entities if e["type"] == "person"])
-                }
-            }
+            if text_content is None:
+                with metrics.stage("export_text"):
+                    if conversion is not None:
+                        text_content = self._export_text(conversion)
+                    else:
+                        text_content = self._decode_text(file_path)
             
-            return result
+            return self.derive_json(conversion, text_content, docling_data, file_type, extraction_method, options)
             
+        except (ConversionLimitError, MemoryError):
+            # Limits are reported as such, never hidden behind the text fallback
+            raise
         except Exception as e:
             print(f"Warning: Docling extraction failed: {e}")
+            metrics.count_failure("extraction")
             # Fallback to basic text processing
-            try:
-                text_content = file_content.decode('utf-8', errors='ignore')
-            except:
-                text_content = str(file_content)
+            text_content = self._decode_text(file_path)
             
-            entities = self.extract_entities_from_text(text_content)
+            entities, entity_counts = entity_extractor.extract(text_content)
             sections = self.extract_sections_from_text(text_content)
             
             return {
@@ -291,55 +300,267 @@ class FileProcessor:
                     "text_length": len(text_content),
                     "word_count": len(text_content.split()),
                     "line_count": len(text_content.split('\n')),
-                    "extraction_method": "fallback"
+                    "extraction_method": "fallback",
+                    **options.to_metadata()
                 },
                 "entities": entities,
                 "sections": sections,
-                "statistics": {
-                    "total_entities": len(entities),
-                    "total_sections": len(sections),
-                    "email_count": len([e for e in entities if e["type"] == "email"]),
-                    "phone_count": len([e for e in entities if e["type"] == "phone"]),
-                    "url_count": len([e for e in entities if e["type"] == "url"]),
-                    "person_count": len([e for e in entities if e["type"] == "person"])
-                }
+                "statistics": self._build_statistics(entities, entity_counts, sections),
+                "chunks": chunk_conversion(None, text_content)
             }
     
-    def process_file(self, file_content: bytes, filename: str, db: Session) -> Dict[str, Any]:
-        """Main method to process file and return JSON data using Docling DocumentConverter"""
-        
-        # Calculate file hash for duplicate detection
-        file_hash = self.calculate_file_hash(file_content)
+    def derive_json(self, conversion, text_content: str, docling_data: Dict[str, Any], file_type: str,
+                    extraction_method: str, options: ConversionOptions) -> Dict[str, Any]:
+        """Build the result from a conversion: entities, sections, statistics and chunks.
         
-        # Check if file already exists in database
-        existing_record = db.query(FileRecord).filter(FileRecord.file_hash == file_hash).first()
+        Also used by reprocessing to refresh results from a cached conversion.
+        """
+        # Extract additional entities and sections
+        with metrics.stage("entities"):
+            entities, entity_counts = entity_extractor.extract(text_content)
+        with metrics.stage("sections"):
+            sections = self.extract_sections(conversion, text_content)
+        chunks = chunk_conversion(conversion, text_content)
         
-        if existing_record:
-            return {
-                "status": "already_available",
-                "message": "File already available in database",
-                "data": json.loads(existing_record.json_data),
-                "filename": existing_record.filename,
-                "created_at": existing_record.created_at.isoformat()
-            }
+        # Create comprehensive JSON structure
+        result = {
+            "full_text": text_content,  # Include the complete text
+            "text_summary": text_content[:500] + "..." if len(text_content) > 500 else text_content,
+            "metadata": {
+                "source": "docling_extraction",
+                "file_type": file_type,
+                "text_length": len(text_content),
+                "word_count": len(text_content.split()),
+                "line_count": len(text_content.split('\n')),
+                "extraction_method": extraction_method,
+                **options.to_metadata()
+            },
+            "entities": entities,
+            "sections": sections,
+            "docling_extraction": docling_data,
+            "statistics": self._build_statistics(entities, entity_counts, sections),
+            # Produced on demand and streamed into their own rows when the result is stored
+            "chunks": chunks
+        }
         
-        # Detect file type
-        file_type = self.detect_file_type(file_content, filename)
+        return result
+    
+    def convert_file(self, file_path: str, filename: str,
+                     options: Optional[ConversionOptions] = None) -> Tuple[str, Dict[str, Any]]:
+        """Detect the file type and extract JSON data, without touching the database"""
+        with metrics.track_processing() as tracker:
+            tracker.input_bytes = os.path.getsize(file_path)
+            with metrics.stage("detect"):
+                file_type = self.detect_file_type(self._read_head(file_path), filename)
+            tracker.file_type = file_type
+            return file_type, self.extract_json_with_docling(file_path, file_type, filename, options)
+    
+    def cache_conversion(self, file_hash: str, file_type: str, filename: str, json_data: Dict[str, Any],
+                         options: Optional[ConversionOptions] = None) -> Optional[str]:
+        """Cache the conversion a result was derived from and return its key.
         
-        # Extract JSON using Docling DocumentConverter
-        json_data = self.extract_json_with_docling(file_content, file_type, filename)
+        Fallback results get a key but nothing is cached, so reprocessing converts them again.
+        """
+        key = conversion_key(file_hash, file_type, filename, options)
+        if cacheable(json_data):
+            store_conversion(self.blob_store, key, json_data)
+        return key
+    
+    def build_record(self, file_path: str, filename: str, file_hash: str, file_type: str, json_data: Dict[str, Any],
+                     options: Optional[ConversionOptions] = None) -> FileRecord:
+        """Store the original and its conversion in the blob store and return an unsaved FileRecord keeping only their keys.
         
-        # Store in database
-        file_record = FileRecord(
+        The result itself is set on the record once its chunks are stored and counted.
+        """
+        self.blob_store.put_file(file_hash, file_path)
+        return FileRecord(
             filename=filename,
             file_hash=file_hash,
-            file_content=file_content,
-            json_data=json.dumps(json_data, ensure_ascii=False),
-            file_type=file_type
+            blob_key=file_hash,
+            file_type=file_type,
+            extractor_version=extractor_version(),
+            conversion_key=self.cache_conversion(file_hash, file_type, filename, json_data, options)
         )
+    
+    def replace_record(self, db: Session, record_id: int, filename: str, file_hash: str, file_type: str,
+                       json_data: Dict[str, Any], options: Optional[ConversionOptions] = None):
+        """Replace the result stored for a file, whose original is already in the blob store"""
+        db.query(FileRecord).filter(FileRecord.id == record_id).update({
+            FileRecord.filename: filename,
+            FileRecord.json_data: json_data,
+            FileRecord.file_type: file_type,
+            FileRecord.extractor_version: extractor_version(),
+            FileRecord.conversion_key: self.cache_conversion(file_hash, file_type, filename, json_data, options)
+        }, synchronize_session=False)
+    
+    def find_record_id(self, file_hash: str, db: Session) -> Optional[int]:
+        """Id of the record stored for a hash, served from the LRU cache when possible"""
+        record_id = hash_cache.get(file_hash)
+        if record_id is not None:
+            return record_id
+        
+        record_id = db.query(FileRecord.id).filter(FileRecord.file_hash == file_hash).scalar()
+        if record_id is not None:
+            hash_cache.put(file_hash, record_id)
+        return record_id
+    
+    def get_existing_result(self, file_hash: str, db: Session,
+                            options: Optional[ConversionOptions] = None) -> Optional[Dict[str, Any]]:
+        """Result for an already processed file, or None if the hash is unknown or
+        the stored result does not answer ``options`` (ConversionOptions.served_by)"""
+        record_id = self.find_record_id(file_hash, db)
+        if record_id is None:
+            return None
+        
+        # The stored JSON text is passed through as RawJSON instead of being parsed
+        existing_record = db.query(
+            FileRecord.filename,
+            FileRecord.file_type,
+            FileRecord.created_at,
+            cast(FileRecord.json_data["metadata"], Text),
+            cast(FileRecord.json_data, Text)
+        ).filter(FileRecord.id == record_id).first()
+        if existing_record is None:
+            # Stale cache entry for a row that no longer exists
+            hash_cache.discard(file_hash)
+            return None
+        
+        filename, file_type, created_at, raw_metadata, raw_data = existing_record
+        if not (options or ConversionOptions()).served_by(json_codec.loads(raw_metadata) if raw_metadata else None, file_type):
+            return None
+        return {
+            "status": "already_available",
+            "message": "File already available in database",
+            "data": json_codec.RawJSON(raw_data) if raw_data is not None else None,
+            "filename": filename,
+            "file_type": file_type,
+            "file_id": record_id,
+            "created_at": created_at.isoformat()
+        }
+    
+    def process_file(self, file_path: str, filename: str, db: Session, file_hash: Optional[str] = None,
+                     options: Optional[ConversionOptions] = None, debug: bool = False) -> Dict[str, Any]:
+        """Main method to process file and return JSON data using Docling DocumentConverter.
+        
+        A file already stored is returned as is when its result answers ``options``
+        (ConversionOptions.served_by); otherwise, e.g. a ``fast-text`` result for a
+        ``full-ocr`` request or a page-limited result for other pages, the file is
+        converted again and its stored result replaced.
+        With ``debug`` the response metadata includes a per-stage timing breakdown.
+        """
+        with metrics.track_processing() as tracker:
+            try:
+                file_hash, result = self._find_existing(file_path, db, file_hash, options, tracker)
+                if result is None:
+                    # Detect file type and extract JSON using Docling DocumentConverter
+                    if self.conversion_runner is not None:
+                        file_type, json_data, stats = self.conversion_runner(file_path, filename, options).result()
+                        tracker.merge(stats)
+                    else:
+                        file_type, json_data = self.convert_file(file_path, filename, options)
+                    result = self._store_result(file_path, filename, db, file_hash, file_type, json_data, options, tracker)
+            except Exception as e:
+                self._count_failure(e, tracker)
+                raise
+            return self._with_timings(result, tracker, debug)
+    
+    async def process_file_async(self, file_path: str, filename: str, db: Session, file_hash: Optional[str] = None,
+                                 options: Optional[ConversionOptions] = None, debug: bool = False) -> Dict[str, Any]:
+        """process_file for the event loop.
+        
+        Database work runs in the threadpool; a conversion in a worker process is
+        awaited without holding a thread while it runs.
+        """
+        with metrics.track_processing() as tracker:
+            try:
+                file_hash, result = await run_in_threadpool(self._find_existing, file_path, db, file_hash, options, tracker)
+                if result is None:
+                    if self.conversion_runner is not None:
+                        future = self.conversion_runner(file_path, filename, options)
+                        file_type, json_data, stats = await asyncio.wrap_future(future)
+                        tracker.merge(stats)
+                    else:
+                        file_type, json_data = await run_in_threadpool(self.convert_file, file_path, filename, options)
+                    result = await run_in_threadpool(
+                        self._store_result, file_path, filename, db, file_hash, file_type, json_data, options, tracker
+                    )
+            except Exception as e:
+                self._count_failure(e, tracker)
+                raise
+            return self._with_timings(result, tracker, debug)
+    
+    @staticmethod
+    def _count_failure(error: Exception, tracker: metrics.ProcessingMetrics):
+        if isinstance(error, ConversionLimitError):
+            metrics.count_failure("limit")
+        tracker.status = "failed"
+    
+    @staticmethod
+    def _with_timings(result: Dict[str, Any], tracker: metrics.ProcessingMetrics, debug: bool) -> Dict[str, Any]:
+        if debug:
+            data = json_codec.load(result["data"]) or {}
+            result["data"] = {**data, "metadata": {**(data.get("metadata") or {}), "timings": tracker.timings_ms()}}
+        return result
+    
+    def _find_existing(self, file_path: str, db: Session, file_hash: Optional[str], options: Optional[ConversionOptions],
+                       tracker: metrics.ProcessingMetrics) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """The file's hash, and its stored result when that answers ``options``"""
+        # Calculate file hash for duplicate detection, unless it was computed while spooling
+        if file_hash is None:
+            with metrics.stage("hash"):
+                file_hash = self.calculate_file_hash_from_path(file_path)
+        
+        # Check if file already exists in database
+        with metrics.stage("duplicate_lookup"):
+            existing_result = self.get_existing_result(file_hash, db, options)
+        
+        if existing_result:
+            tracker.file_type = existing_result["file_type"] or "unknown"
+            tracker.status = "already_available"
+            metrics.DUPLICATE_HITS.inc(source="hash_check")
+        return file_hash, existing_result
+    
+    def _store_result(self, file_path: str, filename: str, db: Session, file_hash: str, file_type: str,
+                      json_data: Dict[str, Any], options: Optional[ConversionOptions],
+                      tracker: metrics.ProcessingMetrics) -> Dict[str, Any]:
+        # Store in database; chunks get their own rows, streamed in as they are produced
+        chunks = take_chunks(json_data)
+        try:
+            # A stored result that did not answer this request (profile or pages) is replaced in place
+            record_id = self.find_record_id(file_hash, db)
+            replace = record_id is not None
+            if not replace:
+                with metrics.stage("store_blob"):
+                    file_record = self.build_record(file_path, filename, file_hash, file_type, json_data, options)
+                
+                with metrics.stage("db_commit"):
+                    db.add(file_record)
+                    db.flush()
+                # Read before the commit expires the record, which would reload and parse its JSON
+                record_id = file_record.id
+            
+            with metrics.stage("store_chunks"):
+                store_result_chunks(db, record_id, file_hash, json_data, chunks, replace=replace)
+        finally:
+            chunks.cleanup()
+        
+        # The JSON is encoded once, with the chunk count, for both the database row and the response
+        with metrics.stage("serialize"):
+            json_data = json_codec.SerializedDict(json_data)
+        with metrics.stage("db_commit"):
+            if replace:
+                self.replace_record(db, record_id, filename, file_hash, file_type, json_data, options)
+            else:
+                file_record.json_data = json_data
+        
+        # Indexed in the same transaction, so every stored file is searchable
+        with metrics.stage("search_index"):
+            index_record(db, record_id, json_data, replace=replace)
         
-        db.add(file_record)
-        db.commit()
+        with metrics.stage("db_commit"):
+            db.commit()
+        hash_cache.put(file_hash, record_id)
+        tracker.status = "processed"
         
         return {
             "status": "processed",
@@ -347,5 +568,6 @@ class FileProcessor:
             "data": json_data,
             "filename": filename,
             "file_type": file_type,
-            "file_hash": file_hash
-        }
\ No newline at end of file
+            "file_hash": file_hash,
+            "file_id": record_id
+        }
@@ -0,0 +1,292 @@
+"""
+Isolated conversion workers and the limits they run under
+
+Conversions run in worker processes, one task at a time per worker. A task
+that runs past CONVERSION_TIMEOUT, grows the worker beyond
+CONVERSION_MAX_RSS_MB or runs out of memory has its worker killed and
+replaced, and fails with ConversionLimitError. So does a task whose worker
+crashes. Other workers, and the web process, are not affected.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+# resource is Unix-only; without it there is no address space limit
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Conversion limits; 0 disables a limit
+CONVERSION_TIMEOUT = float(os.getenv("CONVERSION_TIMEOUT", "600"))
+CONVERSION_MAX_RSS_MB = int(os.getenv("CONVERSION_MAX_RSS_MB", "6144"))
+CONVERSION_MAX_PAGES = int(os.getenv("CONVERSION_MAX_PAGES", "1000"))
+# Address space (RLIMIT_AS) of each worker; off by default as model runtimes reserve a lot of it
+CONVERSION_ADDRESS_SPACE_MB = int(os.getenv("CONVERSION_ADDRESS_SPACE_MB", "0"))
+# Run /upload/ conversions in the worker processes instead of the web process
+CONVERSION_ISOLATION = os.getenv("CONVERSION_ISOLATION", "true").lower() in ("1", "true", "yes")
+
+# Seconds between limit checks while a task runs
+_POLL_INTERVAL = 0.25
+
+
+class ConversionLimitError(Exception):
+    """A conversion exceeded a limit or crashed its worker; the file cannot be converted as is"""
+
+
+def process_rss_bytes(pid: int) -> int:
+    """Resident set size of a process, or 0 when it cannot be read"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def pdf_page_count(file_path: str) -> Optional[int]:
+    """Number of pages of a PDF, or None when it cannot be read cheaply"""
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+
+    try:
+        document = pypdfium2.PdfDocument(file_path)
+    except Exception:
+        # Malformed files are left to the converter and its fallbacks
+        return None
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+def check_page_limit(page_count: Optional[int], page_range: Optional[tuple]):
+    """Refuse documents with more pages to convert than CONVERSION_MAX_PAGES"""
+    if not CONVERSION_MAX_PAGES or page_count is None:
+        return
+    start, end = page_range or (1, page_count)
+    if min(end, page_count) - start + 1 > CONVERSION_MAX_PAGES:
+        raise ConversionLimitError(
+            f"Document has {page_count} pages, more than the limit of {CONVERSION_MAX_PAGES}; "
+            f"convert part of it with page_start, page_end or max_pages"
+        )
+
+
+def _worker_main(conn, initializer: Optional[Callable[[], None]], address_space_mb: int):
+    """Loop of a worker process: run tasks received on ``conn`` and send back their outcome"""
+    if address_space_mb and RESOURCE_AVAILABLE:
+        limit = address_space_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if initializer is not None:
+        initializer()
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        func, args = task
+        try:
+            outcome = ("ok", func(*args))
+        except MemoryError:
+            # The heap may be left unusable: report and let the pool replace this process
+            limit = f" (address space limit {address_space_mb} MB)" if address_space_mb else ""
+            conn.send(("fatal", ConversionLimitError(f"Conversion ran out of memory{limit}")))
+            break
+        except Exception as e:
+            outcome = ("error", e)
+
+        try:
+            conn.send(outcome)
+        except Exception as e:
+            # The result or exception could not be pickled
+            conn.send(("error", RuntimeError(f"{type(outcome[1]).__name__}: {outcome[1]} ({e})")))
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe"""
+
+    def __init__(self, context, initializer: Optional[Callable[[], None]], address_space_mb: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer, address_space_mb))
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        # Cleared when the worker must be replaced: it broke a limit or exited
+        self.healthy = True
+        # Only one thread reads the pipe at a time (warm_up may wait while a task starts)
+        self._lock = threading.RLock()
+
+    def _wait(self, deadline: Optional[float], max_rss: int, timeout: float):
+        """Block until a message arrives, enforcing the limits meanwhile"""
+        try:
+            while not self.conn.poll(_POLL_INTERVAL):
+                if not self.process.is_alive():
+                    break
+                if max_rss and process_rss_bytes(self.process.pid) > max_rss:
+                    self.healthy = False
+                    raise ConversionLimitError(f"Conversion exceeded the memory limit of {max_rss // (1024 * 1024)} MB")
+                if deadline is not None and time.monotonic() > deadline:
+                    self.healthy = False
+                    raise ConversionLimitError(f"Conversion timed out after {timeout:g} s")
+            return self.conn.recv()
+        except (EOFError, OSError):
+            self.healthy = False
+            self.process.join(1)
+            raise ConversionLimitError(f"Conversion worker exited unexpectedly (exit code {self.process.exitcode})")
+
+    def wait_ready(self):
+        with self._lock:
+            if not self.ready:
+                self._wait(None, 0, 0)
+                self.ready = True
+
+    def call(self, func: Callable, args: tuple, timeout: float, max_rss: int) -> Any:
+        """Run ``func(*args)`` in the worker and return its result or raise its exception"""
+        with self._lock:
+            self.wait_ready()
+            self.conn.send((func, args))
+            status, value = self._wait(time.monotonic() + timeout if timeout else None, max_rss, timeout)
+        if status == "fatal":
+            self.healthy = False
+        if status != "ok":
+            raise value
+        return value
+
+    def stop(self):
+        """Ask the worker to exit after its current task"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(5)
+        self.conn.close()
+
+
+class IsolatedWorkerPool:
+    """Fixed number of worker processes running one task each, under the conversion limits.
+
+    Workers are spawned (never forked) on first use or by ``warm_up``, and run
+    ``initializer`` once before their first task. ``submit`` returns a
+    concurrent Future, like an executor.
+    """
+
+    def __init__(self, size: int, initializer: Optional[Callable[[], None]] = None,
+                 timeout: float = CONVERSION_TIMEOUT, max_rss_mb: int = CONVERSION_MAX_RSS_MB,
+                 address_space_mb: int = CONVERSION_ADDRESS_SPACE_MB):
+        self.size = max(1, size)
+        self.initializer = initializer
+        self.timeout = timeout
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.address_space_mb = address_space_mb
+        self._context = multiprocessing.get_context("spawn")
+        # One dispatcher thread per worker: a task holds its worker until it is done
+        self._threads = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="conversion-worker")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        # Set by shutdown; workers killed afterwards are not replaced
+        self._closed = False
+
+    @property
+    def ready(self) -> bool:
+        """True once every worker has started and run its initializer"""
+        with self._lock:
+            return len(self._workers) >= self.size and all(worker.ready for worker in self._workers)
+
+    def _spawn(self) -> Optional[_Worker]:
+        """Start a worker unless the pool is full"""
+        with self._lock:
+            if self._closed or len(self._workers) >= self.size:
+                return None
+            worker = _Worker(self._context, self.initializer, self.address_space_mb)
+            self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: _Worker):
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def warm_up(self):
+        """Start all workers and wait until they are initialized"""
+        while True:
+            worker = self._spawn()
+            if worker is None:
+                break
+            self._idle.put(worker)
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            if not worker.ready:
+                try:
+                    worker.wait_ready()
+                except ConversionLimitError as e:
+                    print(f"Warning: Conversion worker failed to start: {e}")
+
+    def _checkout(self) -> _Worker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = self._spawn() or self._idle.get()
+            if worker.process.is_alive():
+                return worker
+            self._retire(worker)
+
+    def _run(self, func: Callable, args: tuple) -> Any:
+        worker = self._checkout()
+        try:
+            return worker.call(func, args, self.timeout, self.max_rss)
+        finally:
+            if worker.healthy:
+                self._idle.put(worker)
+            else:
+                # Kill the worker and start its replacement right away
+                self._retire(worker)
+                replacement = self._spawn()
+                if replacement is not None:
+                    self._idle.put(replacement)
+                    threading.Thread(target=self._await_start, args=(replacement,),
+                                     name="conversion-worker-start", daemon=True).start()
+
+    def _await_start(self, worker: _Worker):
+        """Wait for a replacement worker's initializer, so the pool reports ready again"""
+        try:
+            worker.wait_ready()
+        except ConversionLimitError as e:
+            if not self._closed:
+                print(f"Warning: Conversion worker failed to start: {e}")
+            self._retire(worker)
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Run ``func(*args)`` in a worker; ``func`` and its arguments must be picklable"""
+        return self._threads.submit(self._run, func, args)
+
+    def shutdown(self):
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._closed = True
+            workers, self._workers = list(self._workers), []
+        for worker in workers:
+            worker.stop()
+        deadline = time.monotonic() + 5
+        for worker in workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            worker.kill()
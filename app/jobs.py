@@ -0,0 +1,245 @@
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import metrics
+from .chunking import spool_chunks
+from .database import SessionLocal, IngestJob, engine
+from .isolation import ConversionLimitError, IsolatedWorkerPool
+from .pipeline_profiles import ConversionOptions
+from .uploads import UPLOAD_SPOOL_DIR, SpooledUpload
+
+# Job queue configuration
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "16"))
+# Worker processes reserved for POST /upload/, so interactive uploads never wait behind jobs and batches
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "1"))
+JOB_SPOOL_DIR = os.getenv("JOB_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "docling_jobs"))
+
+# Per-process FileProcessor, created once by the worker initializer
+_worker_processor = None
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no free slots"""
+
+
+def _init_worker():
+    """Prepare a worker process: own DB connections and a ready FileProcessor"""
+    global _worker_processor
+    from .converter_pool import ConverterPool
+    from .file_processor import FileProcessor
+
+    # Never reuse connections inherited from the parent process
+    engine.dispose(close=False)
+
+    # Each worker converts one file at a time, so one warm converter is enough
+    _worker_processor = FileProcessor(ConverterPool(size=1))
+    _worker_processor.warm_up()
+
+
+def _run_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Process one queued upload inside a worker process and return its metrics"""
+    db = SessionLocal()
+    try:
+        job = db.get(IngestJob, job_id)
+        if job is None:
+            return None
+
+        job.status = "running"
+        db.commit()
+
+        spool_path = job.spool_path
+        with metrics.track_processing(observe=False) as tracker:
+            try:
+                options = ConversionOptions.from_dict(job.options)
+                try:
+                    result = _worker_processor.process_file(spool_path, job.filename, db, options=options)
+                except IntegrityError:
+                    # Another worker stored the same file first; serve its result
+                    db.rollback()
+                    result = _worker_processor.process_file(spool_path, job.filename, db, options=options)
+
+                job.status = "completed"
+                job.result_status = result["status"]
+                job.file_record_id = result.get("file_id")
+            except Exception as e:
+                db.rollback()
+                job = db.get(IngestJob, job_id)
+                job.status = "failed"
+                job.error = str(e)
+
+        db.commit()
+        _remove_spool_file(spool_path)
+        return tracker.to_dict()
+    finally:
+        db.close()
+
+
+def _convert_file(file_path: str, filename: str, options: Optional[ConversionOptions] = None):
+    """Convert one file inside a worker process; the caller stores the result.
+
+    Returns (file_type, json_data, metrics) so the caller can record the metrics.
+    The chunks are a SpooledChunks whose file the caller removes once they are stored.
+    """
+    with metrics.track_processing(observe=False) as tracker:
+        file_type, json_data = _worker_processor.convert_file(file_path, filename, options)
+        # Chunks are produced on demand from the conversion; the parent reads them from a spool file
+        with metrics.stage("chunks"):
+            json_data["chunks"] = spool_chunks(json_data["chunks"], UPLOAD_SPOOL_DIR)
+    return file_type, json_data, tracker.to_dict()
+
+
+def _remove_spool_file(path: Optional[str]):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+class JobQueue:
+    """Bounded queue of upload jobs executed by a pool of Docling worker processes.
+
+    Workers run under the conversion limits of app.isolation; one that breaks
+    a limit is killed and replaced, and its job or conversion fails.
+    Conversions for POST /upload/ run in a separate, smaller pool.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_pending: int = JOB_QUEUE_SIZE,
+                 upload_workers: int = UPLOAD_WORKERS):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.upload_workers = upload_workers
+        self._executor: Optional[IsolatedWorkerPool] = None
+        self._upload_executor: Optional[IsolatedWorkerPool] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs queued or running"""
+        return self._pending
+
+    def is_full(self) -> bool:
+        return self._pending >= self.max_pending
+
+    @property
+    def ready(self) -> bool:
+        """True once every worker process, upload workers included, is started and warmed up"""
+        return all(executor is not None and executor.ready for executor in (self._executor, self._upload_executor))
+
+    def _get_executor(self) -> IsolatedWorkerPool:
+        if self._executor is None:
+            self._executor = IsolatedWorkerPool(self.max_workers, initializer=_init_worker)
+        return self._executor
+
+    def _get_upload_executor(self) -> IsolatedWorkerPool:
+        if self._upload_executor is None:
+            self._upload_executor = IsolatedWorkerPool(self.upload_workers, initializer=_init_worker)
+        return self._upload_executor
+
+    def warm_up(self):
+        """Start the worker processes and wait until their converters are built"""
+        with self._lock:
+            executors = [self._get_upload_executor(), self._get_executor()]
+        for executor in executors:
+            executor.warm_up()
+
+    def enqueue(self, spooled: SpooledUpload, db: Session, options: Optional[ConversionOptions] = None) -> IngestJob:
+        """Record a job for a spooled upload and hand it to the worker pool"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                spooled.cleanup()
+                raise QueueFullError("Job queue is full")
+            self._pending += 1
+
+        job_id = uuid.uuid4().hex
+        try:
+            job = IngestJob(
+                id=job_id,
+                filename=spooled.filename,
+                spool_path=spooled.path,
+                status="queued",
+                options=options.to_dict() if options else None
+            )
+            db.add(job)
+            db.commit()
+
+            self._submit(job_id)
+            return job
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            spooled.cleanup()
+            raise
+
+    def _submit(self, job_id: str):
+        with self._lock:
+            executor = self._get_executor()
+        future = executor.submit(_run_job, job_id)
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def submit_conversion(self, file_path: str, filename: str, options: Optional[ConversionOptions] = None) -> Future:
+        """Convert a file in the worker pool and return a future of (file_type, json_data, metrics)"""
+        with self._lock:
+            executor = self._get_executor()
+        return executor.submit(_convert_file, file_path, filename, options)
+
+    def submit_upload_conversion(self, file_path: str, filename: str, options: Optional[ConversionOptions] = None) -> Future:
+        """Like submit_conversion, in the workers reserved for POST /upload/"""
+        with self._lock:
+            executor = self._get_upload_executor()
+        return executor.submit(_convert_file, file_path, filename, options)
+
+    def _on_done(self, job_id: str, future):
+        with self._lock:
+            self._pending -= 1
+
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is None:
+            # Metrics collected in the worker are recorded in this process
+            metrics.observe_processing(future.result())
+            return
+
+        # The worker was stopped at a limit or died before it could record the outcome
+        db = SessionLocal()
+        try:
+            job = db.get(IngestJob, job_id)
+            if job is not None:
+                job.status = "failed"
+                job.error = str(error) if isinstance(error, ConversionLimitError) else f"Worker failed: {error}"
+                db.commit()
+                _remove_spool_file(job.spool_path)
+        finally:
+            db.close()
+
+    def resume(self, db: Session):
+        """Re-queue jobs left unfinished by a previous run"""
+        jobs = db.query(IngestJob).filter(IngestJob.status.in_(["queued", "running"])).all()
+
+        for job in jobs:
+            if job.spool_path and os.path.exists(job.spool_path):
+                job.status = "queued"
+                db.commit()
+                with self._lock:
+                    self._pending += 1
+                self._submit(job.id)
+            else:
+                job.status = "failed"
+                job.error = "Upload was lost before processing completed"
+                db.commit()
+
+    def shutdown(self):
+        with self._lock:
+            executors = [self._executor, self._upload_executor]
+            self._executor = self._upload_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown()
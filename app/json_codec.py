@@ -0,0 +1,116 @@
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Union
+
+from starlette.responses import Response
+
+# orjson is optional: it serializes large documents several times faster than the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# "orjson" (default when installed) or "stdlib"
+JSON_CODEC = os.getenv("JSON_CODEC", "orjson" if ORJSON_AVAILABLE else "stdlib").lower()
+
+if JSON_CODEC not in ("orjson", "stdlib"):
+    raise ValueError("JSON_CODEC must be 'orjson' or 'stdlib'")
+if JSON_CODEC == "orjson" and not ORJSON_AVAILABLE:
+    print("Warning: JSON_CODEC=orjson but orjson is not installed. Using the stdlib json module.")
+    JSON_CODEC = "stdlib"
+
+USE_ORJSON = JSON_CODEC == "orjson"
+
+
+def _default(obj):
+    """Types the stdlib encoder does not know, serialized like orjson and pydantic do"""
+    if isinstance(obj, datetime):
+        text = obj.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, default=_default)
+
+
+def dumps_bytes(obj) -> bytes:
+    """UTF-8 JSON for ``obj``; values already serialized are not encoded again"""
+    if isinstance(obj, SerializedDict):
+        return obj.json_bytes
+    if isinstance(obj, RawJSON):
+        return obj.raw
+    if USE_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+        except TypeError:
+            # Integers over 64 bits, lone surrogates...: keep the stdlib behaviour
+            pass
+    return _stdlib_dumps(obj).encode("utf-8", "surrogatepass")
+
+
+def dumps(obj) -> str:
+    """JSON text for ``obj``, keeping non-ASCII text readable (used for JSON columns)"""
+    if USE_ORJSON or isinstance(obj, (SerializedDict, RawJSON)):
+        return dumps_bytes(obj).decode("utf-8", "surrogatepass")
+    return _stdlib_dumps(obj)
+
+
+def loads(raw: Union[str, bytes]) -> Any:
+    if USE_ORJSON:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # The stdlib is more lenient, e.g. with NaN written by older rows
+            pass
+    return json.loads(raw)
+
+
+class SerializedDict(dict):
+    """A dict carrying its JSON encoding, so storing and returning it serializes it only once.
+
+    The encoding is taken when the dict is created; do not modify it afterwards.
+    """
+
+    def __init__(self, data: Dict[str, Any], json_bytes: Optional[bytes] = None):
+        super().__init__(data)
+        self.json_bytes = json_bytes if json_bytes is not None else dumps_bytes(data)
+
+
+class RawJSON:
+    """JSON text read from the database, passed through to responses without being parsed"""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: Union[str, bytes]):
+        self.raw = raw.encode() if isinstance(raw, str) else raw
+
+    def load(self) -> Any:
+        return loads(self.raw)
+
+
+def load(value: Any) -> Any:
+    """Parsed form of a value that may be RawJSON"""
+    return value.load() if isinstance(value, RawJSON) else value
+
+
+class RawJSONResponse(Response):
+    """JSON response encoded with the fast codec.
+
+    Top-level values that are SerializedDict or RawJSON are written as they
+    are, so large documents go out without a parse and re-encode round trip
+    or response model validation.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if not isinstance(content, dict):
+            return dumps_bytes(content)
+        return b"{" + b",".join(
+            dumps_bytes(str(key)) + b":" + dumps_bytes(value) for key, value in content.items()
+        ) + b"}"
@@ -1,16 +1,30 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import tuple_, cast, Text
+from sqlalchemy.exc import IntegrityError, TimeoutError as SQLAlchemyTimeoutError
 from sqlalchemy.orm import Session
-import uvicorn
+from datetime import datetime
+from typing import Optional
+import asyncio
+import base64
+import json
+import re
 import os
 from dotenv import load_dotenv
 
-from .database import get_db, init_db
+from . import json_codec, metrics, search
+from .batch import stream_batch
+from .database import get_db, init_db, pool_status, database_reachable, SessionLocal
 from .file_processor import FileProcessor
-from .models import FileUploadResponse, FileRecordResponse, ErrorResponse
+from .isolation import CONVERSION_ISOLATION, ConversionLimitError
+from .jobs import JobQueue, QueueFullError, JOB_SPOOL_DIR
+from .pipeline_profiles import DEFAULT_PROFILE, ConversionOptions
+from .models import FileUploadResponse, FileRecordResponse, JobResponse, SearchResult, ChunkResponse, ErrorResponse
+from .uploads import SpooledUpload, UploadTooLargeError, spool_request, MAX_BATCH_FILES
 
 load_dotenv()
 
@@ -29,56 +43,364 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts, latency and body sizes per route
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Templates
 templates = Jinja2Templates(directory="templates")
 
-# Initialize file processor
+# Initialize file processor; Docling itself is only imported when converters are built
 file_processor = FileProcessor()
 
+# How converters are warmed up at startup: "background" (light endpoints are served
+# right away and /readyz reports ready once done), "blocking" (before serving) or "off"
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background").lower()
+_warmup_task: Optional[asyncio.Task] = None
+
+# Background ingestion queue
+job_queue = JobQueue()
+
+# Uploads are converted by worker processes reserved for them, so a pathological file
+# is stopped at the conversion limits without affecting the web process, and uploads
+# never wait behind jobs and batches
+if CONVERSION_ISOLATION:
+    file_processor.conversion_runner = job_queue.submit_upload_conversion
+
+# Values read when /metrics is scraped
+metrics.Gauge("docling_job_queue_depth", "Background jobs queued or running", lambda: job_queue.depth)
+metrics.Gauge("docling_db_pool_size", "Persistent database connections", lambda: pool_status().get("size"))
+metrics.Gauge("docling_db_pool_checked_out", "Database connections in use", lambda: pool_status().get("checkedout"))
+metrics.Gauge("docling_db_pool_overflow", "Database connections above the pool size", lambda: pool_status().get("overflow"))
+
+async def _warm_up_converters():
+    try:
+        await run_in_threadpool(job_queue.warm_up if CONVERSION_ISOLATION else file_processor.warm_up)
+        print("✅ Docling converters ready")
+    except Exception as e:
+        print(f"Warning: Docling warm-up failed, converters will be built on first use: {e}")
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    init_db()
+    """Initialize database and warm up Docling converters on startup"""
+    global _warmup_task
+    await run_in_threadpool(init_db)
+    
+    # Pick up jobs that were still pending when the server stopped
+    db = SessionLocal()
+    try:
+        await run_in_threadpool(job_queue.resume, db)
+    finally:
+        db.close()
+    
+    if STARTUP_WARMUP == "blocking":
+        await _warm_up_converters()
+    elif STARTUP_WARMUP != "off":
+        # Conversions requested before this finishes build their own converter
+        _warmup_task = asyncio.create_task(_warm_up_converters())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the job worker pool"""
+    job_queue.shutdown()
+
+@app.exception_handler(SQLAlchemyTimeoutError)
+async def pool_timeout_handler(request: Request, exc: SQLAlchemyTimeoutError):
+    """All database connections stayed busy for DB_POOL_TIMEOUT seconds"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     """Serve the main HTML page"""
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/upload/", response_model=FileUploadResponse)
+def conversion_options(
+    profile: str = Query(DEFAULT_PROFILE, description="Pipeline profile: default, fast-text, tables or full-ocr"),
+    page_start: Optional[int] = Query(None, ge=1, description="First page to convert"),
+    page_end: Optional[int] = Query(None, ge=1, description="Last page to convert"),
+    max_pages: Optional[int] = Query(None, ge=1, description="Convert at most this many pages")
+) -> ConversionOptions:
+    """Conversion options from the query string of an upload"""
+    try:
+        return ConversionOptions(profile, page_start, page_end, max_pages)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _upload_response(result: dict) -> json_codec.RawJSONResponse:
+    """FileUploadResponse body written directly: ``data`` is sent as already encoded
+    or stored, without being validated and re-encoded through the model"""
+    return json_codec.RawJSONResponse({field: result.get(field) for field in FileUploadResponse.model_fields})
+
+def _multipart_body(field: str, many: bool = False) -> dict:
+    """OpenAPI request body of the upload endpoints, which parse their multipart body themselves"""
+    file_schema = {"type": "string", "format": "binary"}
+    return {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "required": [field],
+        "properties": {field: {"type": "array", "items": file_schema} if many else file_schema}
+    }}}}}
+
+async def _spool_request(request: Request, field: str, directory: str = None, max_files: int = 1,
+                         skip_too_large: bool = False):
+    """Stream the files of a multipart upload to disk, turning size and format problems into HTTP errors"""
+    try:
+        return await spool_request(request, field, directory=directory, max_files=max_files,
+                                   skip_too_large=skip_too_large)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _spool_or_reject(request: Request, directory: str = None) -> SpooledUpload:
+    """Stream the single file of an upload to disk"""
+    spooled, _ = await _spool_request(request, "file", directory=directory)
+    if not spooled:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    if spooled[0].size == 0:
+        spooled[0].cleanup()
+        raise HTTPException(status_code=400, detail="Empty file")
+    
+    return spooled[0]
+
+@app.post("/upload/", response_model=FileUploadResponse, openapi_extra=_multipart_body("file"))
 async def upload_file(
-    file: UploadFile = File(...),
+    request: Request,
+    file_sha256: Optional[str] = Header(None, alias="X-File-SHA256"),
+    options: ConversionOptions = Depends(conversion_options),
+    debug: bool = Query(False, description="Include a per-stage timing breakdown in metadata.timings"),
     db: Session = Depends(get_db)
 ):
-    """Upload and process a file using Docling"""
+    """Upload and process a file using Docling.
     
-    if not file:
-        raise HTTPException(status_code=400, detail="No file provided")
+    Clients may send the file's SHA-256 in ``X-File-SHA256``; a known hash is
+    answered from the database without spooling or converting the upload.
+    To skip sending the bytes at all, check ``HEAD /files/by-hash/{sha}`` first.
+    
+    ``profile``, ``page_start``, ``page_end`` and ``max_pages`` select the Docling
+    pipeline and pages. A stored result converted with a cheaper profile, or a
+    page-limited one for other pages, is converted again and replaced.
+    
+    A file whose conversion breaks a limit (time, memory or page count) gets ``422``.
+    """
+    
+    if file_sha256:
+        file_sha256 = _validate_sha256(file_sha256)
+        existing_result = await run_in_threadpool(file_processor.get_existing_result, file_sha256, db, options)
+        if existing_result:
+            metrics.DUPLICATE_HITS.inc(source="sha256_header")
+            metrics.FILES_TOTAL.inc(file_type=existing_result["file_type"] or "unknown", status="already_available")
+            return _upload_response(existing_result)
+    
+    # Stream the upload from the request body to a single spool file, hashing it on the way
+    spooled = await _spool_or_reject(request)
+    
+    if file_sha256 and spooled.file_hash != file_sha256:
+        spooled.cleanup()
+        raise HTTPException(status_code=400, detail="X-File-SHA256 does not match the uploaded content")
     
     try:
-        # Read file content
-        file_content = await file.read()
-        
-        if not file_content:
-            raise HTTPException(status_code=400, detail="Empty file")
-        
-        # Process the file
-        result = file_processor.process_file(file_content, file.filename, db)
+        # Process the file off the event loop so other requests keep being served
+        process_args = (spooled.path, spooled.filename, db, spooled.file_hash, options, debug)
+        try:
+            result = await file_processor.process_file_async(*process_args)
+        except IntegrityError:
+            # A concurrent upload of the same file was stored first; serve its result
+            db.rollback()
+            result = await file_processor.process_file_async(*process_args)
         
-        return FileUploadResponse(**result)
+        return _upload_response(result)
         
+    except HTTPException:
+        raise
+    except ConversionLimitError as e:
+        raise HTTPException(status_code=422, detail=f"File could not be converted: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+    finally:
+        spooled.cleanup()
+
+@app.post("/upload/batch", openapi_extra=_multipart_body("files", many=True))
+async def upload_batch(
+    request: Request,
+    options: ConversionOptions = Depends(conversion_options)
+):
+    """Upload many files, or zip/tar archives of files, and process them in parallel.
+    
+    The response is NDJSON: one line per file with its status
+    (processed, already_available, duplicate_in_batch or failed) and
+    file_id, written as soon as that file is done.
+    """
+    # Files over the size limit are reported as failed instead of failing the batch
+    spooled, too_large = await _spool_request(request, "files", max_files=MAX_BATCH_FILES, skip_too_large=True)
+    if not spooled and not too_large:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    rejected = [{"filename": filename, "status": "failed", "error": error} for filename, error in too_large]
+    spooled_files = []
+    for upload in spooled:
+        if upload.size == 0:
+            upload.cleanup()
+            rejected.append({"filename": upload.filename, "status": "failed", "error": "Empty file"})
+        else:
+            spooled_files.append(upload)
+    
+    return StreamingResponse(
+        stream_batch(spooled_files, rejected, file_processor, job_queue, options),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/jobs/", response_model=JobResponse, status_code=202, openapi_extra=_multipart_body("file"))
+async def create_job(
+    request: Request,
+    options: ConversionOptions = Depends(conversion_options),
+    db: Session = Depends(get_db)
+):
+    """Queue a file for background processing and return its job id immediately"""
+    
+    # Refuse early instead of reading a body we cannot queue
+    if job_queue.is_full():
+        raise HTTPException(status_code=429, detail="Job queue is full, retry later", headers={"Retry-After": "5"})
+    
+    # The spool file is handed over to the worker, which removes it when done
+    spooled = await _spool_or_reject(request, directory=JOB_SPOOL_DIR)
+    
+    try:
+        job = await run_in_threadpool(job_queue.enqueue, spooled, db, options)
+    except QueueFullError:
+        raise HTTPException(status_code=429, detail="Job queue is full, retry later", headers={"Retry-After": "5"})
+    
+    return JobResponse(
+        job_id=job.id,
+        status=job.status,
+        filename=job.filename,
+        created_at=job.created_at
+    )
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    """Get the status of a queued file, and its result once processed"""
+    from .database import FileRecord, IngestJob
+    
+    job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # The stored JSON text is passed through without being parsed
+    data = None
+    if job.status == "completed" and job.file_record_id is not None:
+        raw_data = db.query(cast(FileRecord.json_data, Text)).filter(FileRecord.id == job.file_record_id).scalar()
+        if raw_data is not None:
+            data = json_codec.RawJSON(raw_data)
+    
+    return json_codec.RawJSONResponse({
+        "job_id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "file_id": job.file_record_id,
+        "result_status": job.result_status,
+        "error": job.error,
+        "data": data,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    })
+
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+def _validate_sha256(file_hash: str) -> str:
+    file_hash = file_hash.strip().lower()
+    if not SHA256_PATTERN.match(file_hash):
+        raise HTTPException(status_code=400, detail="Expected a hex-encoded SHA-256 hash")
+    return file_hash
+
+@app.head("/files/by-hash/{file_hash}")
+def head_file_by_hash(file_hash: str, db: Session = Depends(get_db)):
+    """Check whether a file with this SHA-256 was already processed, without uploading it"""
+    file_hash = _validate_sha256(file_hash)
+    record_id = file_processor.find_record_id(file_hash, db)
+    
+    if record_id is None:
+        return Response(status_code=404)
+    metrics.DUPLICATE_HITS.inc(source="by_hash")
+    return Response(status_code=200, headers={"X-File-Id": str(record_id)})
+
+@app.get("/files/by-hash/{file_hash}", response_model=FileRecordResponse)
+def get_file_by_hash(file_hash: str, db: Session = Depends(get_db)):
+    """Look up a processed file by its SHA-256"""
+    from .database import FileRecord
+    
+    file_hash = _validate_sha256(file_hash)
+    record_id = file_processor.find_record_id(file_hash, db)
+    
+    # Only the columns FileRecordResponse needs, never the JSON or blob columns
+    file_record = db.query(
+        FileRecord.id,
+        FileRecord.filename,
+        FileRecord.file_type,
+        FileRecord.created_at,
+        FileRecord.updated_at
+    ).filter(FileRecord.id == record_id).first() if record_id is not None else None
+    
+    if not file_record:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    return FileRecordResponse(
+        id=file_record.id,
+        filename=file_record.filename,
+        file_type=file_record.file_type,
+        created_at=file_record.created_at,
+        updated_at=file_record.updated_at
+    )
+
+# The read endpoints below are plain functions: FastAPI runs them, and their
+# get_db sessions, in its threadpool so blocking queries never stall the event loop.
 
 @app.get("/files/", response_model=list[FileRecordResponse])
-async def list_files(db: Session = Depends(get_db)):
-    """List all processed files"""
+def list_files(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    file_type: Optional[str] = None,
+    filename_prefix: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """List processed files, newest first.
+    
+    Pages are keyed on (created_at, id); pass the X-Next-Cursor header of a
+    response as ``cursor`` to get the following page.
+    """
     from .database import FileRecord
     
-    files = db.query(FileRecord).order_by(FileRecord.created_at.desc()).all()
+    # Only the columns FileRecordResponse needs, never the JSON or blob columns
+    query = db.query(
+        FileRecord.id,
+        FileRecord.filename,
+        FileRecord.file_type,
+        FileRecord.created_at,
+        FileRecord.updated_at
+    )
+    
+    if file_type:
+        query = query.filter(FileRecord.file_type == file_type)
+    if filename_prefix:
+        query = query.filter(FileRecord.filename.startswith(filename_prefix, autoescape=True))
+    if cursor:
+        created_at, last_id = _decode_cursor(cursor)
+        query = query.filter(tuple_(FileRecord.created_at, FileRecord.id) < tuple_(created_at, last_id))
+    
+    files = query.order_by(FileRecord.created_at.desc(), FileRecord.id.desc()).limit(limit + 1).all()
+    
+    if len(files) > limit:
+        files = files[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(files[-1].created_at, files[-1].id)
+    
     return [FileRecordResponse(
         id=file.id,
         filename=file.filename,
@@ -87,24 +409,178 @@ async def list_files(db: Session = Depends(get_db)):
         updated_at=file.updated_at
     ) for file in files]
 
+def _encode_cursor(created_at: datetime, file_id: int) -> str:
+    """Opaque pagination cursor for the (created_at, id) position of a row"""
+    raw = json.dumps([created_at.isoformat(), file_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, file_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(file_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/search", response_model=list[SearchResult])
+def search_files(
+    q: Optional[str] = Query(None, description="Full-text query, e.g. 'quarterly revenue'"),
+    entity: Optional[str] = Query(None, description="Entity value the files must mention, e.g. an email address"),
+    entity_type: Optional[str] = Query(None, description="email, phone, url, date or person"),
+    file_type: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Search processed files by full text and/or entities.
+    
+    Full-text matches are ranked best first and come with a highlighted snippet;
+    entity-only lookups return the newest files first.
+    """
+    if not (q and q.strip()) and not entity and not entity_type:
+        raise HTTPException(status_code=400, detail="Provide q, entity or entity_type")
+    
+    try:
+        results = search.search(
+            db, q=q.strip() if q else None, entity=entity, entity_type=entity_type,
+            file_type=file_type, limit=limit, offset=offset
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    return [SearchResult(**result) for result in results]
+
+# Size of the pieces stored JSON is streamed in
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_]+$')
+
 @app.get("/files/{file_id}/json")
-async def get_file_json(file_id: int, db: Session = Depends(get_db)):
-    """Get JSON data for a specific file"""
+def get_file_json(file_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    """Get JSON data for a specific file.
+    
+    ``fields`` selects top-level keys of the data, e.g. ``metadata,statistics,entities``.
+    The keys are extracted by the database and the stored JSON text is streamed
+    out as-is, without being parsed in Python.
+    """
     from .database import FileRecord
-    import json
     
-    file_record = db.query(FileRecord).filter(FileRecord.id == file_id).first()
+    keys = None
+    if fields:
+        keys = [key.strip() for key in fields.split(',') if key.strip()]
+        if not keys or not all(FIELD_NAME_PATTERN.match(key) for key in keys):
+            raise HTTPException(status_code=400, detail="Invalid fields parameter")
+        data_columns = [cast(FileRecord.json_data[key], Text) for key in keys]
+    else:
+        data_columns = [cast(FileRecord.json_data, Text)]
     
-    if not file_record:
+    row = db.query(
+        FileRecord.filename,
+        FileRecord.file_type,
+        FileRecord.created_at,
+        *data_columns
+    ).filter(FileRecord.id == file_id).first()
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    return StreamingResponse(_stream_file_json(row, keys), media_type="application/json")
+
+def _stream_file_json(row, keys: Optional[list]):
+    """Yield the /files/{id}/json body around the raw JSON text returned by the database"""
+    filename, file_type, created_at, *raw_values = row
+    
+    yield (
+        '{"filename": ' + json.dumps(filename, ensure_ascii=False) +
+        ', "file_type": ' + json.dumps(file_type) +
+        ', "created_at": ' + json.dumps(created_at.isoformat()) +
+        ', "data": '
+    ).encode()
+    
+    if keys is None:
+        pieces = [raw_values[0] or 'null']
+    else:
+        pieces = ['{']
+        for index, (key, raw) in enumerate(zip(keys, raw_values)):
+            pieces.append((', ' if index else '') + json.dumps(key) + ': ')
+            pieces.append(raw if raw is not None else 'null')
+        pieces.append('}')
+    
+    for piece in pieces:
+        for start in range(0, len(piece), JSON_STREAM_CHUNK_SIZE):
+            yield piece[start:start + JSON_STREAM_CHUNK_SIZE].encode()
+    
+    yield b'}'
+
+@app.get("/files/{file_id}/chunks", response_model=list[ChunkResponse])
+def get_file_chunks(
+    file_id: int,
+    response: Response,
+    page: Optional[int] = Query(None, ge=1, description="Only chunks with text from this page"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = Query(None, ge=0, description="X-Next-Cursor of the previous response"),
+    db: Session = Depends(get_db)
+):
+    """Page through the chunks of a file in reading order.
+    
+    Chunks are CHUNK_SIZE characters with CHUNK_OVERLAP characters repeated
+    from the previous chunk; their ids stay the same as long as the file and
+    the chunk settings do.
+    """
+    from .database import FileChunk, FileRecord
+    
+    if db.query(FileRecord.id).filter(FileRecord.id == file_id).scalar() is None:
         raise HTTPException(status_code=404, detail="File not found")
     
-    return {
-        "filename": file_record.filename,
-        "file_type": file_record.file_type,
-        "created_at": file_record.created_at.isoformat(),
-        "data": json.loads(file_record.json_data)
+    query = db.query(FileChunk).filter(FileChunk.file_id == file_id)
+    if page is not None:
+        query = query.filter(FileChunk.page_start <= page, FileChunk.page_end >= page)
+    if cursor is not None:
+        query = query.filter(FileChunk.chunk_index > cursor)
+    
+    chunks = query.order_by(FileChunk.chunk_index).limit(limit + 1).all()
+    
+    if len(chunks) > limit:
+        chunks = chunks[:limit]
+        response.headers["X-Next-Cursor"] = str(chunks[-1].chunk_index)
+    
+    return [ChunkResponse(
+        chunk_id=chunk.chunk_id,
+        index=chunk.chunk_index,
+        text=chunk.content,
+        page_start=chunk.page_start,
+        page_end=chunk.page_end,
+        heading=chunk.heading
+    ) for chunk in chunks]
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus metrics"""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/healthz")
+async def liveness():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readiness(response: Response):
+    """Readiness: converters warmed up and the database reachable"""
+    checks = {
+        "converters": STARTUP_WARMUP == "off" or (job_queue.ready if CONVERSION_ISOLATION else file_processor.ready),
+        "database": database_reachable()
     }
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = 503
+    return {"status": "ready" if ready else "not_ready", "checks": checks}
+
+@app.get("/db/pool")
+def get_pool_status():
+    """Database connection pool usage"""
+    return pool_status()
 
 if __name__ == "__main__":
+    import uvicorn
+    
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port) 
\ No newline at end of file
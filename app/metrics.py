@@ -0,0 +1,325 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, from a fast cached lookup to a long OCR run
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Size buckets in bytes, 1 KiB to 1 GiB in steps of four
+SIZE_BUCKETS = tuple(1024 * 4 ** power for power in range(11))
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """A named metric with optional labels, kept in the module registry"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: Tuple[str, ...], value: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def _render_value(self, key: Tuple[str, ...], value: Any) -> List[str]:
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="+Inf"' if bound == float("inf") else f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """A value read from ``callback`` whenever the metrics are scraped"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Optional[float]]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"Warning: Could not read metric {self.name}: {e}")
+            value = None
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        if value is not None:
+            lines.append(f"{self.name} {_format_value(value)}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for metric in list(REGISTRY):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = Histogram(
+    "docling_stage_duration_seconds", "Time spent in each processing stage", ("stage", "file_type")
+)
+PROCESS_SECONDS = Histogram(
+    "docling_process_duration_seconds", "Total time to process one file", ("file_type", "status")
+)
+INPUT_BYTES = Histogram(
+    "docling_input_bytes", "Size of processed input files", ("file_type",), buckets=SIZE_BUCKETS
+)
+FILES_TOTAL = Counter("docling_files_total", "Files handled, by outcome", ("file_type", "status"))
+DUPLICATE_HITS = Counter(
+    "docling_duplicate_hits_total", "Uploads answered from an already stored result", ("source",)
+)
+CONVERSION_FAILURES = Counter(
+    "docling_conversion_failures_total", "Conversions that failed or fell back", ("file_type", "stage")
+)
+HTTP_REQUESTS = Counter("docling_http_requests_total", "HTTP requests", ("method", "route", "status"))
+HTTP_SECONDS = Histogram("docling_http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+HTTP_REQUEST_BYTES = Histogram(
+    "docling_http_request_bytes", "HTTP request body size", ("route",), buckets=SIZE_BUCKETS
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "docling_http_response_bytes", "HTTP response body size", ("route",), buckets=SIZE_BUCKETS
+)
+
+
+class ProcessingMetrics:
+    """Stage timings and outcome of processing one file.
+
+    Collected where the work happens and recorded with ``observe``; worker
+    processes return ``to_dict()`` so the server process can record it.
+    """
+
+    def __init__(self):
+        self.file_type = "unknown"
+        self.status: Optional[str] = None
+        self.input_bytes: Optional[int] = None
+        self.stages: Dict[str, float] = {}
+        self.failures: List[str] = []
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def timings_ms(self) -> Dict[str, float]:
+        """Per-stage breakdown for the debug response metadata"""
+        timings = {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+        timings["total"] = round((time.perf_counter() - self._start) * 1000, 3)
+        return timings
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file_type": self.file_type,
+            "status": self.status,
+            "input_bytes": self.input_bytes,
+            "stages": self.stages,
+            "failures": self.failures,
+            "duration": self.duration if self.duration is not None else time.perf_counter() - self._start
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProcessingMetrics":
+        tracker = cls()
+        tracker.file_type = data.get("file_type") or "unknown"
+        tracker.status = data.get("status")
+        tracker.input_bytes = data.get("input_bytes")
+        tracker.stages = dict(data.get("stages") or {})
+        tracker.failures = list(data.get("failures") or [])
+        tracker.duration = data.get("duration")
+        return tracker
+
+    def merge(self, data: Dict[str, Any]):
+        """Add the stages of work done for this file in a worker process"""
+        self.file_type = data.get("file_type") or self.file_type
+        if data.get("input_bytes") is not None:
+            self.input_bytes = data["input_bytes"]
+        for name, seconds in (data.get("stages") or {}).items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.failures.extend(data.get("failures") or [])
+
+    def observe(self):
+        if not METRICS_ENABLED:
+            return
+        duration = self.duration if self.duration is not None else time.perf_counter() - self._start
+
+        for name, seconds in self.stages.items():
+            STAGE_SECONDS.observe(seconds, stage=name, file_type=self.file_type)
+        for stage in self.failures:
+            CONVERSION_FAILURES.inc(file_type=self.file_type, stage=stage)
+        if self.input_bytes is not None:
+            INPUT_BYTES.observe(self.input_bytes, file_type=self.file_type)
+        if self.status:
+            FILES_TOTAL.inc(file_type=self.file_type, status=self.status)
+            PROCESS_SECONDS.observe(duration, file_type=self.file_type, status=self.status)
+
+
+_current: ContextVar[Optional[ProcessingMetrics]] = ContextVar("processing_metrics", default=None)
+
+
+@contextmanager
+def track_processing(observe: bool = True) -> Iterator[ProcessingMetrics]:
+    """Collect the metrics of one file; nested calls share the outer tracker"""
+    tracker = _current.get()
+    if tracker is not None:
+        yield tracker
+        return
+
+    tracker = ProcessingMetrics()
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+        tracker.duration = time.perf_counter() - tracker._start
+        if observe:
+            tracker.observe()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage of the file currently being processed, if any"""
+    tracker = _current.get()
+    if tracker is None:
+        yield
+        return
+    with tracker.stage(name):
+        yield
+
+
+def count_failure(stage_name: str):
+    """Record a failed or fallen-back conversion step of the current file"""
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.failures.append(stage_name)
+    elif METRICS_ENABLED:
+        CONVERSION_FAILURES.inc(file_type="unknown", stage=stage_name)
+
+
+def observe_processing(data: Optional[Dict[str, Any]]):
+    """Record metrics collected in a worker process"""
+    if data:
+        ProcessingMetrics.from_dict(data).observe()
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    endpoint = scope.get("endpoint")
+    return getattr(endpoint, "__name__", "unmatched")
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests, latency and body sizes per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        sizes = {"in": 0, "out": 0}
+        status = {"code": 500}
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["in"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes["out"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            route = _route_label(scope)
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(method=method, route=route, status=status["code"])
+            HTTP_SECONDS.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUEST_BYTES.observe(sizes["in"], route=route)
+            HTTP_RESPONSE_BYTES.observe(sizes["out"], route=route)
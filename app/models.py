@@ -9,6 +9,7 @@ class FileUploadResponse(BaseModel):
     filename: str
     file_type: Optional[str] = None
     file_hash: Optional[str] = None
+    file_id: Optional[int] = None
     created_at: Optional[str] = None
 
 class FileRecordResponse(BaseModel):
@@ -18,6 +19,33 @@ class FileRecordResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    filename: str
+    file_id: Optional[int] = None
+    result_status: Optional[str] = None
+    error: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class SearchResult(BaseModel):
+    id: int
+    filename: str
+    file_type: Optional[str] = None
+    created_at: datetime
+    rank: Optional[float] = None
+    snippet: Optional[str] = None
+
+class ChunkResponse(BaseModel):
+    chunk_id: str
+    index: int
+    text: str
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+    heading: Optional[str] = None
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Optional[str] = None 
\ No newline at end of file
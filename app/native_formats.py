@@ -0,0 +1,358 @@
+import csv
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .sections import HEADING_PATTERN, iter_lines
+
+# docling_core (and pandas with it) is imported by the handlers on first use,
+# so importing this module stays cheap
+if TYPE_CHECKING:
+    from docling_core.types.doc import DoclingDocument, TableData
+
+# Formats read directly instead of through the Docling pipeline; pdf, pptx and
+# images still go to Docling, where layout analysis and OCR are actually needed
+NATIVE_FORMATS = {
+    fmt.strip().lower()
+    for fmt in os.getenv("NATIVE_FORMATS", "txt,md,csv,docx,xlsx").split(",")
+    if fmt.strip()
+}
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+MARKDOWN_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+CELL_REFERENCE_PATTERN = re.compile(r'([A-Z]+)')
+
+
+class NativeConversion:
+    """Result of a native handler, shaped like Docling's ConversionResult.
+
+    ``text`` is set when the original text should be kept as ``full_text``
+    instead of the Markdown export of the document.
+    """
+
+    def __init__(self, document: "DoclingDocument", text: Optional[str] = None):
+        self.document = document
+        self.text = text
+
+
+def _table(rows: List[List[str]], num_cols: int) -> "TableData":
+    """Table data from rows of cell text, the first row being the header"""
+    from docling_core.types.doc import TableCell, TableData
+
+    cells = [
+        TableCell(
+            text=value,
+            start_row_offset_idx=row_index,
+            end_row_offset_idx=row_index + 1,
+            start_col_offset_idx=col_index,
+            end_col_offset_idx=col_index + 1,
+            column_header=row_index == 0
+        )
+        for row_index, row in enumerate(rows)
+        for col_index, value in enumerate(row)
+        if value
+    ]
+    return TableData(num_rows=len(rows), num_cols=num_cols, table_cells=cells)
+
+
+def _add_text_block(document: "DoclingDocument", lines: List[str]):
+    from docling_core.types.doc import DocItemLabel
+
+    if lines:
+        document.add_text(label=DocItemLabel.PARAGRAPH, text="\n".join(lines))
+
+
+def convert_text(file_path: str, filename: str) -> NativeConversion:
+    """Plain text: heading-like lines become headings, the lines between them paragraphs.
+
+    Headings use the same rules as the text-based section detection, so the
+    sections produced from the document match the ones produced from the text.
+    """
+    from docling_core.types.doc import DoclingDocument
+
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    document = DoclingDocument(name=filename)
+    paragraph: List[str] = []
+
+    for line in iter_lines(text):
+        line = line.strip()
+        if not line:
+            _add_text_block(document, paragraph)
+            paragraph = []
+            continue
+
+        match = HEADING_PATTERN.match(line)
+        if match:
+            _add_text_block(document, paragraph)
+            paragraph = []
+            if match.lastgroup == "numbered":
+                document.add_heading(text=line, level=1)
+            else:
+                document.add_title(text=line)
+        else:
+            paragraph.append(line)
+
+    _add_text_block(document, paragraph)
+    return NativeConversion(document, text)
+
+
+def convert_markdown(file_path: str, filename: str) -> NativeConversion:
+    """Markdown: ATX headings and paragraphs; fenced code is kept as one block"""
+    from docling_core.types.doc import DocItemLabel, DoclingDocument
+
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    document = DoclingDocument(name=filename)
+    paragraph: List[str] = []
+    code: Optional[List[str]] = None
+
+    for line in iter_lines(text):
+        if line.lstrip().startswith("```"):
+            if code is None:
+                _add_text_block(document, paragraph)
+                paragraph, code = [], []
+            else:
+                if code:
+                    document.add_text(label=DocItemLabel.CODE, text="\n".join(code))
+                code = None
+            continue
+        if code is not None:
+            code.append(line)
+            continue
+
+        line = line.strip()
+        match = MARKDOWN_HEADING_PATTERN.match(line)
+        if not line or match:
+            _add_text_block(document, paragraph)
+            paragraph = []
+        if match:
+            level = len(match.group(1))
+            if level == 1:
+                document.add_title(text=match.group(2))
+            else:
+                document.add_heading(text=match.group(2), level=level - 1)
+        elif line:
+            paragraph.append(line)
+
+    if code:
+        document.add_text(label=DocItemLabel.CODE, text="\n".join(code))
+    _add_text_block(document, paragraph)
+    return NativeConversion(document, text)
+
+
+def convert_csv(file_path: str, filename: str) -> NativeConversion:
+    """CSV: read row by row into a single table, keeping the original text"""
+    from docling_core.types.doc import DoclingDocument
+
+    document = DoclingDocument(name=filename)
+    with open(file_path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+        try:
+            dialect = csv.Sniffer().sniff(f.read(8192), delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        f.seek(0)
+
+        rows = []
+        num_cols = 0
+        for row in csv.reader(f, dialect):
+            if row:
+                rows.append(row)
+                num_cols = max(num_cols, len(row))
+        if rows:
+            document.add_table(data=_table(rows, num_cols))
+        # The table holds the cell text; the rows are dropped before the file is
+        # read again for full_text, so the text and the table are the only copies
+        del rows
+
+        f.seek(0)
+        text = f.read()
+
+    return NativeConversion(document, text)
+
+
+def _docx_styles(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Map style ids to lower-case style names, e.g. 'Heading1' -> 'heading 1'"""
+    try:
+        root = ET.fromstring(archive.read("word/styles.xml"))
+    except KeyError:
+        return {}
+
+    styles = {}
+    for style in root.iter(WORD_NS + "style"):
+        name = style.find(WORD_NS + "name")
+        if name is not None:
+            styles[style.get(WORD_NS + "styleId")] = name.get(WORD_NS + "val", "").lower()
+    return styles
+
+
+def _docx_text(element) -> str:
+    parts = []
+    for node in element.iter():
+        if node.tag == WORD_NS + "t" and node.text:
+            parts.append(node.text)
+        elif node.tag == WORD_NS + "tab":
+            parts.append("\t")
+        elif node.tag in (WORD_NS + "br", WORD_NS + "cr"):
+            parts.append("\n")
+    return "".join(parts).strip()
+
+
+def convert_docx(file_path: str, filename: str) -> NativeConversion:
+    """Born-digital DOCX: paragraphs, headings, list items and tables from word/document.xml"""
+    from docling_core.types.doc import DocItemLabel, DoclingDocument
+
+    with zipfile.ZipFile(file_path) as archive:
+        styles = _docx_styles(archive)
+        body = ET.fromstring(archive.read("word/document.xml")).find(WORD_NS + "body")
+
+    document = DoclingDocument(name=filename)
+    if body is None:
+        return NativeConversion(document)
+
+    for element in body:
+        if element.tag == WORD_NS + "tbl":
+            rows = [
+                [_docx_text(cell) for cell in row.iter(WORD_NS + "tc")]
+                for row in element.iter(WORD_NS + "tr")
+            ]
+            if rows:
+                document.add_table(data=_table(rows, max(len(row) for row in rows)))
+            continue
+
+        if element.tag != WORD_NS + "p":
+            continue
+        text = _docx_text(element)
+        if not text:
+            continue
+
+        properties = element.find(WORD_NS + "pPr")
+        style_id = None
+        is_list_item = False
+        if properties is not None:
+            style = properties.find(WORD_NS + "pStyle")
+            if style is not None:
+                style_id = style.get(WORD_NS + "val")
+            is_list_item = properties.find(WORD_NS + "numPr") is not None
+        style_name = styles.get(style_id, (style_id or "").lower())
+
+        if style_name == "title":
+            document.add_title(text=text)
+        elif style_name.startswith("heading") and style_name[7:].strip().isdigit():
+            document.add_heading(text=text, level=min(int(style_name[7:]), 100))
+        elif is_list_item or style_name.startswith("list"):
+            document.add_list_item(text=text)
+        else:
+            document.add_text(label=DocItemLabel.PARAGRAPH, text=text)
+
+    return NativeConversion(document)
+
+
+def _column_index(reference: str) -> int:
+    """Zero-based column of a cell reference such as 'AB12'"""
+    match = CELL_REFERENCE_PATTERN.match(reference)
+    index = 0
+    for char in match.group(1) if match else "A":
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index - 1
+
+
+def _xlsx_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    try:
+        source = archive.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+
+    strings = []
+    with source:
+        for _, element in ET.iterparse(source):
+            if element.tag == SHEET_NS + "si":
+                strings.append("".join(node.text or "" for node in element.iter(SHEET_NS + "t")))
+                element.clear()
+    return strings
+
+
+def _xlsx_sheets(archive: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """(sheet name, part path) in workbook order"""
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    relationships = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in relationships.iter(PACKAGE_REL_NS + "Relationship")}
+
+    sheets = []
+    for sheet in workbook.iter(SHEET_NS + "sheet"):
+        target = targets.get(sheet.get(REL_NS + "id"))
+        if target:
+            path = target.lstrip("/") if target.startswith("/") else "xl/" + target
+            sheets.append((sheet.get("name"), path))
+    return sheets
+
+
+def _xlsx_rows(source, shared_strings: List[str]) -> Iterator[List[str]]:
+    """Stream the rows of a worksheet part, one element at a time"""
+    for _, element in ET.iterparse(source):
+        if element.tag != SHEET_NS + "row":
+            continue
+
+        row: List[str] = []
+        for cell in element.iter(SHEET_NS + "c"):
+            cell_type = cell.get("t")
+            if cell_type == "inlineStr":
+                value = "".join(node.text or "" for node in cell.iter(SHEET_NS + "t"))
+            else:
+                node = cell.find(SHEET_NS + "v")
+                value = node.text if node is not None and node.text else ""
+                if cell_type == "s" and value:
+                    value = shared_strings[int(value)]
+                elif cell_type == "b" and value:
+                    value = "TRUE" if value == "1" else "FALSE"
+
+            column = _column_index(cell.get("r", ""))
+            if column >= len(row):
+                row.extend([""] * (column + 1 - len(row)))
+            row[column] = value
+
+        element.clear()
+        yield row
+
+
+def convert_xlsx(file_path: str, filename: str) -> NativeConversion:
+    """XLSX: one heading and one table per worksheet, with cell values as stored"""
+    from docling_core.types.doc import DoclingDocument
+
+    document = DoclingDocument(name=filename)
+
+    with zipfile.ZipFile(file_path) as archive:
+        shared_strings = _xlsx_shared_strings(archive)
+        for sheet_name, path in _xlsx_sheets(archive):
+            with archive.open(path) as source:
+                rows = [row for row in _xlsx_rows(source, shared_strings) if any(row)]
+            document.add_heading(text=sheet_name, level=1)
+            if rows:
+                document.add_table(data=_table(rows, max(len(row) for row in rows)))
+
+    return NativeConversion(document)
+
+
+# Handler per native format name, as used in NATIVE_FORMATS
+NATIVE_HANDLERS: Dict[str, Callable[[str, str], NativeConversion]] = {
+    "txt": convert_text,
+    "md": convert_markdown,
+    "csv": convert_csv,
+    "docx": convert_docx,
+    "xlsx": convert_xlsx
+}
+
+
+def native_format(file_type: str, filename: str) -> Optional[str]:
+    """Name of the native handler for a file, or None when Docling should convert it"""
+    # Markdown is detected as 'txt', so the extension decides between the two
+    fmt = "md" if file_type == "txt" and (filename or "").lower().endswith((".md", ".markdown")) else file_type
+    return fmt if fmt in NATIVE_FORMATS and fmt in NATIVE_HANDLERS else None
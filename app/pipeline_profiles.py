@@ -0,0 +1,181 @@
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional
+
+# Docling is imported when a converter is first built, not when this module is
+if TYPE_CHECKING:
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+    from docling.document_converter import DocumentConverter
+
+from .converter_pool import default_converter
+
+DEFAULT_PROFILE = "default"
+
+# Profiles whose converters are built at startup; others are built on first use
+PIPELINE_PROFILES_WARMUP = os.getenv("PIPELINE_PROFILES_WARMUP", DEFAULT_PROFILE)
+
+
+def _pdf_converter(options: "PdfPipelineOptions") -> "DocumentConverter":
+    """Converter using ``options`` for PDFs and images, defaults for other formats"""
+    from docling.datamodel.base_models import InputFormat
+    from docling.document_converter import DocumentConverter, PdfFormatOption
+
+    format_option = PdfFormatOption(pipeline_options=options)
+    return DocumentConverter(format_options={InputFormat.PDF: format_option, InputFormat.IMAGE: format_option})
+
+
+def _fast_text_converter() -> "DocumentConverter":
+    """Born-digital PDFs: text layer only, no OCR and no table structure model"""
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+
+    return _pdf_converter(PdfPipelineOptions(do_ocr=False, do_table_structure=False))
+
+
+def _tables_converter() -> "DocumentConverter":
+    """Born-digital PDFs with tables: accurate table structure, no OCR"""
+    from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+
+    options = PdfPipelineOptions(do_ocr=False, do_table_structure=True)
+    options.table_structure_options.mode = TableFormerMode.ACCURATE
+    return _pdf_converter(options)
+
+
+def _full_ocr_converter() -> "DocumentConverter":
+    """Scanned documents: OCR every page, tables included"""
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+
+    options = PdfPipelineOptions(do_ocr=True, do_table_structure=True)
+    options.ocr_options.force_full_page_ocr = True
+    return _pdf_converter(options)
+
+
+# Converter factory per profile name
+PIPELINE_PROFILES: Dict[str, Callable[[], "DocumentConverter"]] = {
+    DEFAULT_PROFILE: default_converter,
+    "fast-text": _fast_text_converter,
+    "tables": _tables_converter,
+    "full-ocr": _full_ocr_converter
+}
+
+# What each profile extracts from PDFs and images. A stored result answers a request
+# for a profile whose features it has, so a cheaper result is converted again for a
+# richer profile (Docling's defaults are OCR and accurate table structure)
+PROFILE_FEATURES: Dict[str, FrozenSet[str]] = {
+    DEFAULT_PROFILE: frozenset({"ocr", "table_structure"}),
+    "fast-text": frozenset(),
+    "tables": frozenset({"table_structure"}),
+    "full-ocr": frozenset({"ocr", "full_page_ocr", "table_structure"})
+}
+
+# File types converted by the PDF and image pipeline the profiles configure
+PROFILE_FILE_TYPES = {"pdf", "png", "jpg", "jpeg", "tif", "tiff", "bmp", "webp"}
+# File types converted page by page; page selection only applies to these
+PAGINATED_FILE_TYPES = PROFILE_FILE_TYPES | {"pptx"}
+
+
+class ConversionOptions:
+    """Pipeline profile and page selection for one conversion"""
+
+    def __init__(
+        self,
+        profile: str = DEFAULT_PROFILE,
+        page_start: Optional[int] = None,
+        page_end: Optional[int] = None,
+        max_pages: Optional[int] = None
+    ):
+        if profile not in PIPELINE_PROFILES:
+            raise ValueError(f"Unknown pipeline profile '{profile}', expected one of: {', '.join(PIPELINE_PROFILES)}")
+        if page_start is not None and page_start < 1:
+            raise ValueError("page_start must be at least 1")
+        if page_end is not None and page_end < (page_start or 1):
+            raise ValueError("page_end must not be before page_start")
+        if max_pages is not None and max_pages < 1:
+            raise ValueError("max_pages must be at least 1")
+
+        self.profile = profile
+        self.page_start = page_start
+        self.page_end = page_end
+        self.max_pages = max_pages
+
+    @property
+    def page_range(self) -> Optional[tuple]:
+        """First and last page to convert (1-based, inclusive), or None for all pages"""
+        if self.page_start is None and self.page_end is None and self.max_pages is None:
+            return None
+
+        start = self.page_start or 1
+        end = self.page_end or sys.maxsize
+        if self.max_pages is not None:
+            end = min(end, start + self.max_pages - 1)
+        return start, end
+
+    def convert_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for DocumentConverter.convert"""
+        page_range = self.page_range
+        return {"page_range": page_range} if page_range else {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile,
+            "page_start": self.page_start,
+            "page_end": self.page_end,
+            "max_pages": self.max_pages
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ConversionOptions":
+        return cls(**data) if data else cls()
+
+    def for_file_type(self, file_type: Optional[str]) -> "ConversionOptions":
+        """These options as they apply to a file type: without pages unless it is paginated"""
+        if self.page_range is None or file_type in PAGINATED_FILE_TYPES:
+            return self
+        return ConversionOptions(self.profile)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Fields recorded in the result metadata"""
+        metadata: Dict[str, Any] = {"pipeline_profile": self.profile}
+        page_range = self.page_range
+        if page_range:
+            metadata["page_range"] = [page_range[0], None if page_range[1] == sys.maxsize else page_range[1]]
+        return metadata
+
+    def served_by(self, metadata: Optional[Dict[str, Any]], file_type: Optional[str]) -> bool:
+        """Whether a stored result of ``file_type``, with ``metadata``, answers a request with these options.
+
+        For PDFs and images the stored profile must have every feature of the
+        requested one (PROFILE_FEATURES). For paginated formats a result of all
+        pages answers any page selection, a page-limited one only the same pages.
+        Other formats are converted the same way whatever the options.
+        """
+        metadata = metadata or {}
+        if file_type in PROFILE_FILE_TYPES:
+            stored_profile = metadata.get("pipeline_profile", DEFAULT_PROFILE)
+            if not PROFILE_FEATURES.get(stored_profile, frozenset()) >= PROFILE_FEATURES[self.profile]:
+                return False
+        if file_type in PAGINATED_FILE_TYPES:
+            stored_page_range = metadata.get("page_range")
+            if stored_page_range is not None and list(stored_page_range) != self.to_metadata().get("page_range"):
+                return False
+        return True
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Dict[str, Any]], keep_pages: bool = False) -> "ConversionOptions":
+        """Options a stored result is converted again with when reprocessed: its profile, on all pages.
+
+        A page-limited result is replaced by the conversion of the whole file;
+        with ``keep_pages`` its stored page range is kept instead.
+        Defaults for results stored before profiles.
+        """
+        metadata = metadata or {}
+        profile = metadata.get("pipeline_profile", DEFAULT_PROFILE)
+        profile = profile if profile in PIPELINE_PROFILES else DEFAULT_PROFILE
+        page_range = metadata.get("page_range")
+        if keep_pages and page_range:
+            return cls(profile, page_start=page_range[0], page_end=page_range[1])
+        return cls(profile)
+
+
+def warmup_profiles() -> List[str]:
+    """Known profile names listed in PIPELINE_PROFILES_WARMUP"""
+    return [profile.strip() for profile in PIPELINE_PROFILES_WARMUP.split(",") if profile.strip() in PIPELINE_PROFILES]
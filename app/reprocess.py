@@ -0,0 +1,226 @@
+"""
+Incremental re-processing of stored results
+
+A record is stale when its conversion was made with other conversion settings
+(its ``conversion_key`` differs from the current one) or its derived layer
+with another extractor (``extractor_version``). Only the stale layer is
+recomputed: derived layers come from the cached conversion, and files are
+converted again only when the conversion settings changed or no conversion
+is cached for them.
+
+Each record is refreshed in its own transaction, as one task of an
+IsolatedWorkerPool, so conversions run under CONVERSION_TIMEOUT and
+CONVERSION_MAX_RSS_MB like uploads do. A page-limited result whose whole
+file is over CONVERSION_MAX_PAGES keeps its pages; if nothing else changed
+it is skipped. Run with ``python -m app.cli reprocess``.
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Text, cast
+from sqlalchemy.orm import Session, defer
+
+from . import json_codec
+from .chunking import store_result_chunks, take_chunks
+from .conversion_cache import conversion_key, extractor_version, load_conversion
+from .database import SessionLocal, FileRecord, engine
+from .isolation import ConversionLimitError, IsolatedWorkerPool, check_page_limit, pdf_page_count
+from .pipeline_profiles import ConversionOptions
+from .search import index_record
+
+REPROCESS_WORKERS = int(os.getenv("REPROCESS_WORKERS", "2"))
+
+# Per-process FileProcessor, created by the worker initializer
+_worker_processor = None
+
+
+def stale_records(db: Session, batch_size: int,
+                  reconvert: bool = False) -> Iterator[List[Tuple[int, str, ConversionOptions, ConversionOptions]]]:
+    """Yield batches of (record id, "convert" or "derive", options, stored options) for the stale records, by id.
+
+    The options convert the whole file; the stored options keep the result's page range.
+    """
+    current_version = extractor_version()
+    last_id = 0
+
+    while True:
+        rows = db.query(
+            FileRecord.id,
+            FileRecord.file_hash,
+            FileRecord.file_type,
+            FileRecord.filename,
+            FileRecord.extractor_version,
+            FileRecord.conversion_key,
+            cast(FileRecord.json_data["metadata"], Text)
+        ).filter(FileRecord.id > last_id).order_by(FileRecord.id).limit(batch_size).all()
+
+        # Do not keep a transaction open while the batch is processed
+        db.commit()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        batch = []
+        for record_id, file_hash, file_type, filename, version, key, raw_metadata in rows:
+            metadata = json_codec.loads(raw_metadata) if raw_metadata else None
+            options = ConversionOptions.from_metadata(metadata)
+            stored_options = ConversionOptions.from_metadata(metadata, keep_pages=True)
+            if reconvert or key is None or key != conversion_key(file_hash, file_type, filename, options):
+                batch.append((record_id, "convert", options, stored_options))
+            elif version != current_version:
+                batch.append((record_id, "derive", options, stored_options))
+        if batch:
+            yield batch
+
+
+def _init_worker():
+    """Prepare a worker process: own DB connections and a FileProcessor.
+
+    Converters are only built if the worker has to convert a file.
+    """
+    global _worker_processor
+    from .converter_pool import ConverterPool
+    from .file_processor import FileProcessor
+
+    # Never reuse connections inherited from the parent process
+    engine.dispose(close=False)
+    _worker_processor = FileProcessor(ConverterPool(size=1))
+
+
+@contextmanager
+def _original(record: FileRecord) -> Iterator[str]:
+    """Copy the stored original to a temporary file and yield its path"""
+    directory = tempfile.mkdtemp(prefix="docling_reprocess_")
+    try:
+        # Keep the original name: the file type is partly detected from the extension
+        path = os.path.join(directory, os.path.basename(record.filename or "") or "file")
+        with open(path, "wb") as out:
+            if record.blob_key:
+                with _worker_processor.blob_store.open(record.blob_key) as blob:
+                    shutil.copyfileobj(blob, out)
+            else:
+                out.write(record.file_content)
+        yield path
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _within_page_limit(path: str, options: ConversionOptions) -> bool:
+    try:
+        check_page_limit(pdf_page_count(path), options.page_range)
+    except ConversionLimitError:
+        return False
+    return True
+
+
+def _derive(record: FileRecord, options: ConversionOptions) -> Optional[Dict[str, Any]]:
+    """Recompute the derived layer from the cached conversion; None when it is not cached"""
+    cached = load_conversion(_worker_processor.blob_store, record.conversion_key)
+    if cached is None:
+        return None
+    return _worker_processor.derive_json(
+        cached["conversion"], cached["text"], cached["document"],
+        record.file_type, cached["extraction_method"], options
+    )
+
+
+def _reprocess_record(record_id: int, action: str, options: ConversionOptions,
+                      stored_options: ConversionOptions, reconvert: bool = False) -> Optional[str]:
+    """Refresh one record in a worker process.
+
+    Returns "converted", "derived" or "skipped", or None when the record is gone.
+    """
+    db = SessionLocal()
+    try:
+        # The stored result is replaced, so it is never loaded
+        record = db.query(FileRecord).options(defer(FileRecord.json_data)).filter(FileRecord.id == record_id).first()
+        if record is None:
+            return None
+
+        json_data = _derive(record, options) if action == "derive" else None
+        file_type, key = record.file_type, record.conversion_key
+        if json_data is None:
+            with _original(record) as path:
+                if not _within_page_limit(path, options):
+                    # The whole file is over CONVERSION_MAX_PAGES: keep the pages it was converted on
+                    options = stored_options
+                    if not reconvert and key == conversion_key(record.file_hash, file_type, record.filename, options):
+                        if record.extractor_version == extractor_version():
+                            return "skipped"
+                        action = "derive"
+                        json_data = _derive(record, options)
+                if json_data is None:
+                    action = "convert"
+                    file_type, json_data = _worker_processor.convert_file(path, record.filename, options)
+                    key = _worker_processor.cache_conversion(record.file_hash, file_type, record.filename, json_data, options)
+
+        # Streams the chunks from the conversion, which is then freed
+        store_result_chunks(db, record.id, record.file_hash, json_data, take_chunks(json_data), replace=True)
+        record.json_data = json_codec.SerializedDict(json_data)
+        record.file_type = file_type
+        record.conversion_key = key
+        record.extractor_version = extractor_version()
+        db.flush()
+        index_record(db, record.id, record.json_data, replace=True)
+        db.commit()
+        return "converted" if action == "convert" else "derived"
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def reprocess(batch_size: int = 10, workers: int = REPROCESS_WORKERS, reconvert: bool = False,
+              dry_run: bool = False) -> Dict[str, int]:
+    """Refresh every stale record, ``workers`` at a time; returns counts per outcome"""
+    totals = {"converted": 0, "derived": 0, "skipped": 0, "failed": 0}
+    db = SessionLocal()
+
+    try:
+        if dry_run:
+            for batch in stale_records(db, batch_size, reconvert):
+                for _, action, _, _ in batch:
+                    totals["converted" if action == "convert" else "derived"] += 1
+            return totals
+
+        pool = IsolatedWorkerPool(max(1, workers), initializer=_init_worker)
+        running = {}
+
+        def collect(done):
+            for future in done:
+                record_id = running.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    print(f"Warning: Could not reprocess file {record_id}: {e}")
+                    outcome = "failed"
+                if not outcome:
+                    continue
+                totals[outcome] += 1
+                if sum(totals.values()) % batch_size == 0:
+                    print(f"Reprocessed {totals['converted']} converted, {totals['derived']} derived, "
+                          f"{totals['skipped']} skipped, {totals['failed']} failed")
+
+        try:
+            # Keep a couple of records queued per worker; the rest are planned batch by batch
+            for batch in stale_records(db, batch_size, reconvert):
+                for item in batch:
+                    running[pool.submit(_reprocess_record, *item, reconvert)] = item[0]
+                    if len(running) >= 2 * pool.size:
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        collect(done)
+            if running:
+                done, _ = wait(running)
+                collect(done)
+        finally:
+            pool.shutdown()
+    finally:
+        db.close()
+
+    return totals
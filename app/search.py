@@ -0,0 +1,248 @@
+"""
+Full-text and entity search over processed documents
+
+Full text is indexed in a ``file_search`` table: a tsvector column with a GIN
+index on PostgreSQL, an FTS5 virtual table on SQLite (local testing). Entities
+are stored one row per distinct (file, type, value) in ``file_entities``.
+Records are indexed in the transaction that stores them; rows stored before
+the index existed are added with ``python -m app.cli index-search``.
+"""
+
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Float, Integer, String, DateTime, bindparam, cast, insert, inspect, text, Text
+from sqlalchemy.orm import Session
+
+from . import json_codec
+from .database import engine, FileEntity, FileRecord
+
+# Text search configuration (PostgreSQL) used to parse documents and queries
+SEARCH_TEXT_CONFIG = os.getenv("SEARCH_TEXT_CONFIG", "english")
+# Only the beginning of very long documents is indexed; PostgreSQL caps a tsvector at 1 MB
+SEARCH_MAX_TEXT_CHARS = int(os.getenv("SEARCH_MAX_TEXT_CHARS", "500000"))
+
+if not re.match(r'^[A-Za-z_][A-Za-z0-9_.]*$', SEARCH_TEXT_CONFIG):
+    raise ValueError(f"Invalid SEARCH_TEXT_CONFIG: {SEARCH_TEXT_CONFIG}")
+
+NORMALIZED_VALUE_LENGTH = 255
+
+_DDL = {
+    "postgresql": [
+        "CREATE TABLE IF NOT EXISTS file_search (file_id INTEGER PRIMARY KEY, search_vector TSVECTOR NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_file_search_vector ON file_search USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        # rowid is the file id
+        "CREATE VIRTUAL TABLE IF NOT EXISTS file_search USING fts5(full_text, tokenize='porter unicode61')",
+    ],
+}
+
+# Fill the index from the stored JSON, so the text never travels to Python and back
+_INDEX_FULL_TEXT = {
+    "postgresql": (
+        f"INSERT INTO file_search (file_id, search_vector) "
+        f"SELECT id, to_tsvector('{SEARCH_TEXT_CONFIG}', left(coalesce(json_data->>'full_text', ''), :max_chars)) "
+        f"FROM file_records WHERE id IN :ids"
+    ),
+    "sqlite": (
+        "INSERT INTO file_search (rowid, full_text) "
+        "SELECT id, substr(coalesce(json_extract(json_data, '$.full_text'), ''), 1, :max_chars) "
+        "FROM file_records WHERE id IN :ids"
+    ),
+}
+_DELETE_FULL_TEXT = {
+    "postgresql": "DELETE FROM file_search WHERE file_id IN :ids",
+    "sqlite": "DELETE FROM file_search WHERE rowid IN :ids",
+}
+_INDEXED_IDS = {
+    "postgresql": "SELECT file_id FROM file_search WHERE file_id IN :ids",
+    "sqlite": "SELECT rowid FROM file_search WHERE rowid IN :ids",
+}
+
+# Set once the file_search table is known to exist in this process
+_full_text_ready = False
+
+
+def init_search_index():
+    """Create the full-text index table for the current database, if supported"""
+    statements = _DDL.get(engine.dialect.name)
+    if statements is None:
+        print(f"Warning: Full-text search is not supported on {engine.dialect.name}; only entity search is available")
+        return
+
+    global _full_text_ready
+    try:
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+        _full_text_ready = True
+    except Exception as e:
+        print(f"Warning: Could not create the full-text search index: {e}")
+
+
+def full_text_available(db: Optional[Session] = None) -> bool:
+    """Whether the file_search table exists; checked on the session's own connection"""
+    global _full_text_ready
+    if not _full_text_ready and engine.dialect.name in _DDL:
+        # A second connection would wait on the session's write lock under SQLite
+        _full_text_ready = inspect(db.connection() if db is not None else engine).has_table("file_search")
+    return _full_text_ready
+
+
+def _statement(statements: Dict[str, str]):
+    return text(statements[engine.dialect.name]).bindparams(bindparam("ids", expanding=True))
+
+
+def normalize_entity(value: str) -> str:
+    return value.strip().lower()[:NORMALIZED_VALUE_LENGTH]
+
+
+def _entity_rows(file_id: int, entities: Optional[Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    rows: Dict[tuple, Dict[str, Any]] = {}
+    for entity in entities or []:
+        value = entity.get("value")
+        if not value or not entity.get("type"):
+            continue
+        occurrences = len(entity.get("offsets") or []) or 1
+        key = (entity["type"], normalize_entity(value))
+        if key in rows:
+            rows[key]["occurrences"] += occurrences
+        else:
+            rows[key] = {
+                "file_id": file_id,
+                "entity_type": entity["type"],
+                "value": value,
+                "normalized_value": key[1],
+                "occurrences": occurrences
+            }
+    return list(rows.values())
+
+
+def _write(db: Session, entities_by_id: Dict[int, Any], replace: bool):
+    ids = list(entities_by_id)
+    if not ids:
+        return
+
+    if replace:
+        db.query(FileEntity).filter(FileEntity.file_id.in_(ids)).delete(synchronize_session=False)
+    rows = [row for file_id, entities in entities_by_id.items() for row in _entity_rows(file_id, entities)]
+    if rows:
+        db.execute(insert(FileEntity), rows)
+
+    if full_text_available(db):
+        if replace:
+            db.execute(_statement(_DELETE_FULL_TEXT), {"ids": ids})
+        db.execute(_statement(_INDEX_FULL_TEXT), {"ids": ids, "max_chars": SEARCH_MAX_TEXT_CHARS})
+
+
+def index_record(db: Session, file_id: int, json_data: Optional[Dict[str, Any]], replace: bool = False):
+    """Index a stored record in the caller's transaction (the row must be flushed).
+
+    ``replace`` drops what was indexed for the record before, e.g. after reprocessing.
+    """
+    _write(db, {file_id: (json_data or {}).get("entities")}, replace)
+
+
+def index_new_records(db: Session, records: List[FileRecord]):
+    """Index a group of records inserted (and flushed) in the caller's transaction"""
+    _write(db, {record.id: (record.json_data or {}).get("entities") for record in records}, replace=False)
+
+
+def index_records(db: Session, file_ids: List[int], replace: bool = True):
+    """(Re)index existing records, reading only their entities from the stored JSON"""
+    if not file_ids:
+        return
+    rows = db.query(FileRecord.id, cast(FileRecord.json_data["entities"], Text)).filter(
+        FileRecord.id.in_(file_ids)
+    ).all()
+    _write(db, {file_id: json_codec.loads(raw) if raw else None for file_id, raw in rows}, replace)
+
+
+def indexed_ids(db: Session, file_ids: List[int]) -> Set[int]:
+    """Which of the records are already in the index"""
+    if not file_ids:
+        return set()
+    if full_text_available(db):
+        return {row[0] for row in db.execute(_statement(_INDEXED_IDS), {"ids": file_ids})}
+    return {row[0] for row in db.query(FileEntity.file_id).filter(FileEntity.file_id.in_(file_ids)).distinct()}
+
+
+def _full_text_query(conditions: List[str]) -> str:
+    where = "".join(f" AND {condition}" for condition in conditions)
+    if engine.dialect.name == "postgresql":
+        # Headlines are only computed for the rows of the requested page
+        return (
+            f"WITH query AS (SELECT websearch_to_tsquery('{SEARCH_TEXT_CONFIG}', :q) AS q), "
+            f"matches AS ("
+            f"SELECT r.id, r.filename, r.file_type, r.created_at, ts_rank(s.search_vector, query.q) AS rank "
+            f"FROM file_search s JOIN file_records r ON r.id = s.file_id, query "
+            f"WHERE s.search_vector @@ query.q{where} "
+            f"ORDER BY rank DESC, r.id DESC LIMIT :limit OFFSET :offset) "
+            f"SELECT m.id, m.filename, m.file_type, m.created_at, m.rank, "
+            f"ts_headline('{SEARCH_TEXT_CONFIG}', left(r.json_data->>'full_text', :max_chars), query.q, "
+            f"'MaxFragments=2, MaxWords=20, MinWords=5') AS snippet "
+            f"FROM matches m JOIN file_records r ON r.id = m.id, query ORDER BY m.rank DESC, m.id DESC"
+        )
+    return (
+        f"SELECT r.id, r.filename, r.file_type, r.created_at, -bm25(file_search) AS rank, "
+        f"snippet(file_search, 0, '<b>', '</b>', '…', 20) AS snippet "
+        f"FROM file_search JOIN file_records r ON r.id = file_search.rowid "
+        f"WHERE file_search MATCH :q{where} "
+        f"ORDER BY bm25(file_search), r.id DESC LIMIT :limit OFFSET :offset"
+    )
+
+
+def _fts5_query(q: str) -> str:
+    """Quote every term so user input is never parsed as FTS5 syntax; terms are ANDed"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+def search(db: Session, q: Optional[str] = None, entity: Optional[str] = None,
+           entity_type: Optional[str] = None, file_type: Optional[str] = None,
+           limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+    """Files matching a full-text query and/or containing an entity, best matches first"""
+    entity_filter = db.query(FileEntity.file_id)
+    if entity:
+        entity_filter = entity_filter.filter(FileEntity.normalized_value == normalize_entity(entity))
+    if entity_type:
+        entity_filter = entity_filter.filter(FileEntity.entity_type == entity_type)
+
+    if not q:
+        # Entity lookup only: newest files first
+        query = db.query(
+            FileRecord.id, FileRecord.filename, FileRecord.file_type, FileRecord.created_at
+        ).filter(FileRecord.id.in_(entity_filter.scalar_subquery()))
+        if file_type:
+            query = query.filter(FileRecord.file_type == file_type)
+        rows = query.order_by(FileRecord.created_at.desc(), FileRecord.id.desc()).limit(limit).offset(offset).all()
+        return [{**row._asdict(), "rank": None, "snippet": None} for row in rows]
+
+    if not full_text_available(db):
+        raise RuntimeError("Full-text search is not available on this database")
+
+    params: Dict[str, Any] = {
+        "q": q if engine.dialect.name == "postgresql" else _fts5_query(q),
+        "limit": limit,
+        "offset": offset,
+        "max_chars": SEARCH_MAX_TEXT_CHARS
+    }
+    conditions = []
+    if file_type:
+        conditions.append("r.file_type = :file_type")
+        params["file_type"] = file_type
+    entity_conditions = []
+    if entity:
+        entity_conditions.append("normalized_value = :entity")
+        params["entity"] = normalize_entity(entity)
+    if entity_type:
+        entity_conditions.append("entity_type = :entity_type")
+        params["entity_type"] = entity_type
+    if entity_conditions:
+        conditions.append(f"r.id IN (SELECT file_id FROM file_entities WHERE {' AND '.join(entity_conditions)})")
+
+    statement = text(_full_text_query(conditions)).columns(
+        id=Integer, filename=String, file_type=String, created_at=DateTime(timezone=True), rank=Float, snippet=String
+    )
+    return [dict(row._mapping) for row in db.execute(statement, params)]
@@ -0,0 +1,82 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+# An all-caps line (level 1) or a numbered heading such as "2. Results" (level 2)
+HEADING_PATTERN = re.compile(r'(?:(?P<caps>[A-Z][A-Z\s]+$)|(?P<numbered>[0-9]+\.\s+[A-Z]))')
+
+# Docling item labels that start a new section
+HEADING_LABELS = {"title", "section_header"}
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of ``text`` one at a time instead of splitting it up front"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _section(title: str, parts: List[str], level: int) -> Dict[str, Any]:
+    return {"title": title, "content": "\n".join(parts) + "\n", "level": level}
+
+
+def iter_sections(text: Union[str, Iterable[str]]) -> Iterator[Dict[str, Any]]:
+    """Yield sections detected from heading-like lines.
+
+    Accepts the whole text or any iterable of lines. Each section's lines
+    are collected in a list and joined once when the section is emitted.
+    """
+    lines = iter_lines(text) if isinstance(text, str) else text
+    title, level, parts = "Main Content", 1, []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        match = HEADING_PATTERN.match(line)
+        if match:
+            if parts:
+                yield _section(title, parts, level)
+            title, level, parts = line, 2 if match.lastgroup == "numbered" else 1, []
+        else:
+            parts.append(line)
+
+    if parts:
+        yield _section(title, parts, level)
+
+
+def document_item_text(item, document) -> Optional[str]:
+    """Text of a DoclingDocument item; tables, which have no text, as Markdown"""
+    if getattr(item, "label", None) == "table" and hasattr(item, "export_to_markdown"):
+        try:
+            return item.export_to_markdown(doc=document)
+        except Exception:
+            pass
+    return getattr(item, "text", None)
+
+
+def iter_sections_from_document(document) -> Iterator[Dict[str, Any]]:
+    """Yield sections following the heading hierarchy of a DoclingDocument"""
+    title, level, parts = "Main Content", 1, []
+
+    for item, _ in document.iterate_items():
+        item_text = document_item_text(item, document)
+        if not item_text or not item_text.strip():
+            continue
+
+        if getattr(item, "label", None) in HEADING_LABELS:
+            if parts:
+                yield _section(title, parts, level)
+            # Titles are top level; Docling section headers start at level 1 below them
+            level = 1 if item.label == "title" else getattr(item, "level", 1) + 1
+            title, parts = item_text.strip(), []
+        else:
+            parts.append(item_text.strip())
+
+    if parts:
+        yield _section(title, parts, level)
@@ -0,0 +1,295 @@
+import hashlib
+import os
+import tarfile
+import tempfile
+import zipfile
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+# Streaming upload configuration
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "200"))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "10000"))
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+# Allowance per file for multipart headers and boundaries in the Content-Length check
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+
+class SpooledUpload:
+    """An upload written to a single file on disk, with its SHA-256 and size"""
+
+    def __init__(self, path: str, filename: str, file_hash: str, size: int):
+        self.path = path
+        self.filename = filename
+        self.file_hash = file_hash
+        self.size = size
+
+    def cleanup(self):
+        """Remove the spooled file"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _suffix_for(filename: Optional[str]) -> str:
+    """Keep the original extension so Docling can recognise the format"""
+    if filename and '.' in filename:
+        return '.' + filename.split('.')[-1].lower()
+    return ''
+
+
+def spool_stream(
+    source: BinaryIO,
+    filename: Optional[str],
+    directory: Optional[str] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    max_size: int = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+) -> SpooledUpload:
+    """Copy a file object to a spool file chunk by chunk, hashing it on the way.
+
+    At most one chunk is held in memory, and the size limit is checked
+    as the data arrives rather than after the whole body was read.
+    """
+    directory = directory or UPLOAD_SPOOL_DIR
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fd, path = tempfile.mkstemp(suffix=_suffix_for(filename), dir=directory)
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, 'wb') as spool_file:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if max_size and size > max_size:
+                    raise UploadTooLargeError(f"File exceeds the {max_size // (1024 * 1024)} MB upload limit")
+
+                hasher.update(chunk)
+                spool_file.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    return SpooledUpload(path, filename, hasher.hexdigest(), size)
+
+
+class _SpoolWriter:
+    """One file part of a multipart body being written to its spool file"""
+
+    def __init__(self, filename: str, directory: Optional[str], max_size: int):
+        fd, self.path = tempfile.mkstemp(suffix=_suffix_for(filename), dir=directory)
+        self.file = os.fdopen(fd, 'wb')
+        self.filename = filename
+        self.max_size = max_size
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        # Data received but not written yet, at most about one chunk
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.error: Optional[str] = None
+
+    def receive(self, data: bytes):
+        """Count data as it is parsed; it is written by ``flush``"""
+        if self.error:
+            return
+        self.size += len(data)
+        if self.max_size and self.size > self.max_size:
+            self.error = f"File exceeds the {self.max_size // (1024 * 1024)} MB upload limit"
+            self.pending, self.pending_size = [], 0
+            return
+        self.pending.append(data)
+        self.pending_size += len(data)
+
+    def flush(self):
+        for data in self.pending:
+            self.hasher.update(data)
+            self.file.write(data)
+        self.pending, self.pending_size = [], 0
+
+    def finish(self) -> SpooledUpload:
+        self.flush()
+        self.file.close()
+        return SpooledUpload(self.path, self.filename, self.hasher.hexdigest(), self.size)
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def spool_request(
+    request: Request,
+    field: str,
+    directory: Optional[str] = None,
+    max_files: int = 1,
+    max_size: int = MAX_UPLOAD_SIZE_MB * 1024 * 1024,
+    skip_too_large: bool = False
+) -> Tuple[List[SpooledUpload], List[Tuple[str, str]]]:
+    """Parse a multipart body as it arrives and spool the files of ``field``, hashing them on the way.
+
+    Each file is written once, straight from the request stream, and the size
+    limit is checked as the data arrives. A file over the limit raises
+    UploadTooLargeError, or with ``skip_too_large`` is dropped and returned
+    with its error as (filename, error). Other form fields are ignored.
+    """
+    if max_size:
+        # Refuse bodies that cannot fit before reading any of them
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_files * (max_size + _MULTIPART_OVERHEAD):
+            raise UploadTooLargeError(f"File exceeds the {max_size // (1024 * 1024)} MB upload limit")
+
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise ValueError("Expected a multipart/form-data body")
+
+    directory = directory or UPLOAD_SPOOL_DIR
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    spooled: List[SpooledUpload] = []
+    rejected: List[Tuple[str, str]] = []
+    # Files of ``field`` seen so far, and those whose part ended but are not closed yet
+    writers: List[_SpoolWriter] = []
+    ended: List[_SpoolWriter] = []
+    # Part being parsed: its headers, and its writer when it is a file of ``field``
+    part: Dict[str, Any] = {}
+    header: List[bytes] = [b"", b""]
+
+    def on_part_begin():
+        part.clear()
+        part["disposition"] = b""
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header[0] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header[1] += data[start:end]
+
+    def on_header_end():
+        if header[0].lower() == b"content-disposition":
+            part["disposition"] = header[1]
+        header[0], header[1] = b"", b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["disposition"])
+        if b"filename" not in options or options.get(b"name", b"").decode("utf-8", "replace") != field:
+            return
+        if len(writers) >= max_files:
+            raise UploadTooLargeError(f"At most {max_files} files per request")
+        part["writer"] = _SpoolWriter(options[b"filename"].decode("utf-8", "replace"), directory, max_size)
+        writers.append(part["writer"])
+
+    def on_part_data(data: bytes, start: int, end: int):
+        writer = part.get("writer")
+        if writer is not None:
+            writer.receive(data[start:end])
+            if writer.error and not skip_too_large:
+                raise UploadTooLargeError(writer.error)
+
+    def on_part_end():
+        writer = part.pop("writer", None)
+        if writer is not None:
+            ended.append(writer)
+
+    def close(writer: _SpoolWriter):
+        if writer.error:
+            writer.discard()
+            rejected.append((writer.filename, writer.error))
+        else:
+            spooled.append(writer.finish())
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end
+    })
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            # Disk writes happen off the event loop, about one chunk at a time
+            while ended:
+                await run_in_threadpool(close, ended.pop(0))
+            writer = part.get("writer")
+            if writer is not None and writer.pending_size >= UPLOAD_CHUNK_SIZE:
+                await run_in_threadpool(writer.flush)
+        parser.finalize()
+        while ended:
+            await run_in_threadpool(close, ended.pop(0))
+        if part.get("writer") is not None:
+            raise ValueError("Multipart body ended in the middle of a file")
+    except BaseException:
+        for writer in writers:
+            writer.discard()
+        for upload in spooled:
+            upload.cleanup()
+        raise
+
+    return spooled, rejected
+
+
+def is_archive(filename: Optional[str]) -> bool:
+    return bool(filename) and filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def expand_archive(
+    spooled: SpooledUpload,
+    directory: Optional[str] = None,
+    max_files: int = MAX_BATCH_FILES
+) -> List[SpooledUpload]:
+    """Spool every regular file of a zip or tar archive, one member at a time"""
+    members: List[SpooledUpload] = []
+
+    def add(source: BinaryIO, name: str):
+        if len(members) >= max_files:
+            raise UploadTooLargeError(f"Archive contains more than {max_files} files")
+        members.append(spool_stream(source, os.path.basename(name), directory))
+
+    try:
+        if spooled.filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(spooled.path) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or _is_hidden(info.filename):
+                        continue
+                    with archive.open(info) as source:
+                        add(source, info.filename)
+        else:
+            with tarfile.open(spooled.path, 'r:*') as archive:
+                for member in archive:
+                    if not member.isfile() or _is_hidden(member.name):
+                        continue
+                    source = archive.extractfile(member)
+                    if source is not None:
+                        with source:
+                            add(source, member.name)
+    except BaseException:
+        for member in members:
+            member.cleanup()
+        raise
+
+    return members
+
+
+def _is_hidden(name: str) -> bool:
+    """Skip OS metadata entries such as __MACOSX/ and dot files"""
+    return any(part.startswith(('.', '__MACOSX')) for part in name.split('/') if part)
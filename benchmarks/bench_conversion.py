@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one Docling conversion per upload vs. the previous two-pass extraction
+
+Usage:
+    python benchmarks/bench_conversion.py sample.pdf sample.docx sample.pptx --repeat 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import native_formats
+from app.file_processor import FileProcessor
+
+
+def two_pass(processor: FileProcessor, file_path: str, file_type: str, filename: str):
+    """Previous behaviour: one conversion for the text, a second one for the structure"""
+    processor.extract_text_from_file(file_path, file_type, filename)
+    processor._export_structure(processor._convert_with_docling(file_path))
+
+
+def single_pass(processor: FileProcessor, file_path: str, file_type: str, filename: str):
+    """Current behaviour: text and structure exported from one ConversionResult"""
+    processor.extract_json_with_docling(file_path, file_type, filename)
+
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help="Sample documents to convert")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file and mode")
+    args = parser.parse_args()
+
+    # Both modes must go through Docling, not the native handlers for simple formats
+    native_formats.NATIVE_FORMATS.clear()
+
+    processor = FileProcessor()
+    timings = defaultdict(lambda: {"two_pass": [], "single_pass": []})
+
+    for path in args.files:
+        filename = os.path.basename(path)
+        file_type = processor.detect_file_type(processor._read_head(path), filename)
+
+        # Warm the pipelines so model loading is not charged to either mode
+        single_pass(processor, path, file_type, filename)
+
+        for _ in range(args.repeat):
+            timings[file_type]["two_pass"].append(time_call(two_pass, processor, path, file_type, filename))
+            timings[file_type]["single_pass"].append(time_call(single_pass, processor, path, file_type, filename))
+
+    print(f"{'format':<8} {'two-pass (s)':>14} {'single-pass (s)':>16} {'speedup':>9}")
+    for file_type, modes in sorted(timings.items()):
+        before = statistics.median(modes["two_pass"])
+        after = statistics.median(modes["single_pass"])
+        speedup = before / after if after else float("inf")
+        print(f"{file_type:<8} {before:>14.3f} {after:>16.3f} {speedup:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-format latency of the Docling pipeline vs. the native handlers
+
+Every file is processed with NATIVE_FORMATS emptied (everything goes through
+Docling, as before) and with the native handlers enabled.
+
+Usage:
+    python benchmarks/bench_formats.py sample.csv sample.txt sample.md sample.docx sample.xlsx --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import native_formats
+from app.file_processor import FileProcessor
+
+
+def run(processor: FileProcessor, path: str, file_type: str, filename: str, native: bool) -> float:
+    enabled = set(native_formats.NATIVE_FORMATS)
+    if not native:
+        native_formats.NATIVE_FORMATS.clear()
+    try:
+        start = time.perf_counter()
+        processor.extract_json_with_docling(path, file_type, filename)
+        return time.perf_counter() - start
+    finally:
+        native_formats.NATIVE_FORMATS.update(enabled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help="Sample documents to convert")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per file and mode")
+    args = parser.parse_args()
+
+    processor = FileProcessor()
+    timings = defaultdict(lambda: {"docling": [], "native": []})
+
+    for path in args.files:
+        filename = os.path.basename(path)
+        file_type = processor.detect_file_type(processor._read_head(path), filename)
+        label = native_formats.native_format(file_type, filename) or file_type
+
+        # Warm the pipelines so model loading is not charged to either mode
+        run(processor, path, file_type, filename, native=False)
+
+        for _ in range(args.repeat):
+            timings[label]["docling"].append(run(processor, path, file_type, filename, native=False))
+            timings[label]["native"].append(run(processor, path, file_type, filename, native=True))
+
+    print(f"{'format':<8} {'docling (s)':>12} {'native (s)':>11} {'speedup':>9}")
+    for file_type, modes in sorted(timings.items()):
+        before = statistics.median(modes["docling"])
+        after = statistics.median(modes["native"])
+        speedup = before / after if after else float("inf")
+        print(f"{file_type:<8} {before:>12.3f} {after:>11.3f} {speedup:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-function throughput of the ingest pipeline on the generated corpus
+
+Measures, for every corpus file:
+- calculate_file_hash
+- convert_file (type detection and extraction, no database)
+- extract_entities_from_text
+- extract_sections_from_text
+- JSON serialization of the result, as done when it is stored
+
+Text functions run on the text the file converts to; they are skipped for
+files that only went through the fallback path (e.g. PDFs when the Docling
+models are not installed).
+
+Usage:
+    python benchmarks/bench_functions.py --corpus benchmarks/corpus --repeat 5 --output results/functions.json
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from corpus import generate
+from results import write_results
+
+from app.database import _json_serializer
+from app.file_processor import FileProcessor
+
+
+def measure(func: Callable[[], Any], repeat: int, size: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "median_s": median,
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "ops_per_s": 1 / median if median else None,
+        "mb_per_s": size / median / (1024 * 1024) if median else None,
+        "input_bytes": size
+    }
+
+
+def bench_file(processor: FileProcessor, path: str, repeat: int) -> Dict[str, Any]:
+    filename = os.path.basename(path)
+    with open(path, "rb") as f:
+        content = f.read()
+
+    results: Dict[str, Any] = {"file": filename, "bytes": len(content), "functions": {}}
+    functions = results["functions"]
+
+    functions["calculate_file_hash"] = measure(lambda: processor.calculate_file_hash(content), repeat, len(content))
+
+    # One untimed conversion first, so pipeline initialization is not measured
+    file_type, json_data = processor.convert_file(path, filename)
+    json_data.pop("chunks", None)
+    # Chunks are produced on demand; consuming them keeps chunking in the measurement
+    functions["convert_file"] = measure(lambda: list(processor.convert_file(path, filename)[1]["chunks"]), repeat, len(content))
+    results["file_type"] = file_type
+    results["extraction_method"] = json_data["metadata"].get("extraction_method")
+
+    serialized = _json_serializer(json_data)
+    functions["json_serialize"] = measure(lambda: _json_serializer(json_data), repeat, len(serialized.encode()))
+
+    docling_failed = isinstance(json_data.get("docling_extraction"), dict) and "error" in json_data["docling_extraction"]
+    if results["extraction_method"] == "fallback" or (docling_failed and file_type not in ("txt", "csv")):
+        print(f"  {filename}: conversion fell back, skipping text functions")
+        return results
+
+    text = json_data["full_text"]
+    text_size = len(text.encode())
+    functions["extract_entities_from_text"] = measure(lambda: processor.extract_entities_from_text(text), repeat, text_size)
+    functions["extract_sections_from_text"] = measure(lambda: processor.extract_sections_from_text(text), repeat, text_size)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Corpus directory (generated into a temporary directory when omitted)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed used when generating the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per function and file")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix="docling_corpus_")
+    if not os.path.isdir(corpus_dir) or not os.listdir(corpus_dir):
+        generate(corpus_dir, args.seed)
+    paths: List[str] = sorted(
+        os.path.join(corpus_dir, name) for name in os.listdir(corpus_dir) if not name.startswith(".")
+    )
+
+    processor = FileProcessor()
+    results = []
+    for path in paths:
+        print(f"Benchmarking {os.path.basename(path)}")
+        results.append(bench_file(processor, path, args.repeat))
+
+    print(f"\n{'file':<12} {'function':<28} {'median (ms)':>12} {'MB/s':>10}")
+    for result in results:
+        for name, stats in result["functions"].items():
+            mb_per_s = f"{stats['mb_per_s']:.1f}" if stats["mb_per_s"] else "-"
+            print(f"{result['file']:<12} {name:<28} {stats['median_s'] * 1000:>12.2f} {mb_per_s:>10}")
+
+    write_results(args.output, "functions", {"corpus": corpus_dir, "seed": args.seed, "repeat": args.repeat}, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON work per /upload/ response on large documents
+
+Converts the large corpus files once, then measures the serialization done
+for one upload response:
+- processed: store the result in the JSON column and send it back
+- already_available: read the stored JSON text and send it back
+
+``baseline`` is the stdlib path through the response model (json.dumps for
+the column, json.loads on read, FileUploadResponse validation, model_dump and
+JSONResponse encoding). ``stdlib`` and ``orjson`` are the json_codec path
+(encode once, stored text passed through) with each codec.
+
+Usage:
+    python benchmarks/bench_json.py --repeat 5 --output results/json.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.responses import JSONResponse
+
+from corpus import generate
+from results import write_results
+
+from app import json_codec
+from app.file_processor import FileProcessor
+from app.models import FileUploadResponse
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """Median seconds over ``repeat`` runs, after one untimed run"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def envelope(status: str, data: Any) -> Dict[str, Any]:
+    return {
+        "status": status,
+        "message": "benchmark",
+        "data": data,
+        "filename": "large",
+        "file_type": "txt",
+        "file_hash": "0" * 64,
+        "file_id": 1,
+        "created_at": "2024-01-15T00:00:00+00:00"
+    }
+
+
+def baseline_response(result: Dict[str, Any]) -> bytes:
+    return JSONResponse(FileUploadResponse(**result).model_dump(mode="json")).body
+
+
+def processed_baseline(json_data: Dict[str, Any]) -> bytes:
+    json.dumps(json_data, ensure_ascii=False)
+    return baseline_response(envelope("processed", json_data))
+
+
+def duplicate_baseline(stored: str) -> bytes:
+    return baseline_response(envelope("already_available", json.loads(stored)))
+
+
+def processed_codec(json_data: Dict[str, Any]) -> bytes:
+    data = json_codec.SerializedDict(json_data)
+    json_codec.dumps(data)
+    return json_codec.RawJSONResponse(envelope("processed", data)).body
+
+
+def duplicate_codec(stored: str) -> bytes:
+    return json_codec.RawJSONResponse(envelope("already_available", json_codec.RawJSON(stored))).body
+
+
+def bench_file(processor: FileProcessor, path: str, repeat: int) -> Dict[str, Any]:
+    filename = os.path.basename(path)
+    _, json_data = processor.convert_file(path, filename)
+    json_data.pop("chunks", None)
+    stored = json.dumps(json_data, ensure_ascii=False)
+
+    codecs = {"baseline": None, "stdlib": False}
+    if json_codec.ORJSON_AVAILABLE:
+        codecs["orjson"] = True
+
+    results: Dict[str, Any] = {"file": filename, "json_bytes": len(stored.encode()), "paths": {}}
+    for path_name, baseline, codec_path, value in (
+        ("processed", processed_baseline, processed_codec, json_data),
+        ("already_available", duplicate_baseline, duplicate_codec, stored),
+    ):
+        timings = {}
+        for codec, use_orjson in codecs.items():
+            if use_orjson is None:
+                timings[codec] = measure(lambda: baseline(value), repeat)
+            else:
+                json_codec.USE_ORJSON = use_orjson
+                timings[codec] = measure(lambda: codec_path(value), repeat)
+        results["paths"][path_name] = timings
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Corpus directory (large files generated into a temporary directory when omitted)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed used when generating the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path and codec")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix="docling_corpus_")
+    if not os.path.isdir(corpus_dir) or not os.listdir(corpus_dir):
+        generate(corpus_dir, args.seed, kinds=["txt", "csv", "docx"], sizes=["large"])
+    paths: List[str] = sorted(
+        os.path.join(corpus_dir, name) for name in os.listdir(corpus_dir) if name.startswith("large.")
+    )
+
+    processor = FileProcessor()
+    results = []
+    for path in paths:
+        print(f"Benchmarking {os.path.basename(path)}")
+        results.append(bench_file(processor, path, args.repeat))
+
+    print(f"\n{'file':<12} {'JSON MB':>8} {'path':<18} {'codec':<9} {'median (ms)':>12} {'speedup':>8}")
+    for result in results:
+        for path_name, timings in result["paths"].items():
+            for codec, seconds in timings.items():
+                speedup = timings["baseline"] / seconds if seconds else 0
+                print(f"{result['file']:<12} {result['json_bytes'] / (1024 * 1024):>8.2f} {path_name:<18} "
+                      f"{codec:<9} {seconds * 1000:>12.2f} {speedup:>7.1f}x")
+
+    write_results(args.output, "json", {"corpus": corpus_dir, "seed": args.seed, "repeat": args.repeat,
+                                        "orjson": json_codec.ORJSON_AVAILABLE}, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: application startup time
+
+Measures, each in a fresh process:
+- importing app.main
+- starting uvicorn until /healthz answers (light endpoints are served)
+- starting uvicorn until /readyz answers (converters warmed up, database reachable)
+
+The server runs against a temporary SQLite database unless --database-url is
+given. With --max-import-seconds / --max-healthz-seconds the script exits
+with status 1 when a median exceeds the limit, so it can guard CI against
+startup regressions (e.g. Docling being imported eagerly again).
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5 --output results/startup.json
+    python benchmarks/bench_startup.py --max-import-seconds 3 --max-healthz-seconds 5 --skip-ready
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from load_test import free_port, start_server, wait_until_ready
+from results import REPO_ROOT, write_results
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import app.main; print(time.perf_counter() - start)"
+
+
+def measure_import(database_url: str) -> float:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_server(database_url: Optional[str], timeout: float, skip_ready: bool) -> Dict[str, Optional[float]]:
+    workdir = tempfile.mkdtemp(prefix="docling_startup_")
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = start_server(database_url or f"sqlite:///{os.path.join(workdir, 'startup.db')}", workdir, port)
+    try:
+        wait_until_ready(url, timeout, server, path="/healthz", poll_interval=0.02)
+        timings: Dict[str, Optional[float]] = {"healthz_s": time.perf_counter() - start, "readyz_s": None}
+        if not skip_ready:
+            wait_until_ready(url, timeout, server, path="/readyz", poll_interval=0.1)
+            timings["readyz_s"] = time.perf_counter() - start
+        return timings
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    return {"median_s": statistics.median(values), "min_s": min(values), "max_s": max(values), "runs": values}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each measurement")
+    parser.add_argument("--database-url", help="Database for the server (default: temporary SQLite)")
+    parser.add_argument("--skip-ready", action="store_true", help="Do not wait for /readyz (converter warm-up)")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for each endpoint")
+    parser.add_argument("--max-import-seconds", type=float, help="Fail when the median import time exceeds this")
+    parser.add_argument("--max-healthz-seconds", type=float, help="Fail when the median time to /healthz exceeds this")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    import_db = args.database_url or "sqlite:///" + os.path.join(tempfile.gettempdir(), "docling_startup_import.db")
+    imports = [measure_import(import_db) for _ in range(args.repeat)]
+    servers = [measure_server(args.database_url, args.timeout, args.skip_ready) for _ in range(args.repeat)]
+
+    results: Dict[str, Any] = {
+        "import_app_main": summarize(imports),
+        "healthz": summarize([run["healthz_s"] for run in servers]),
+    }
+    if not args.skip_ready:
+        results["readyz"] = summarize([run["readyz_s"] for run in servers])
+
+    for name, stats in results.items():
+        print(f"{name:<16} median {stats['median_s']:.3f}s  (min {stats['min_s']:.3f}s, max {stats['max_s']:.3f}s)")
+
+    params = {"repeat": args.repeat, "skip_ready": args.skip_ready,
+              "database": (args.database_url or "sqlite").split("://")[0]}
+    write_results(args.output, "startup", params, results)
+
+    failures = []
+    if args.max_import_seconds is not None and results["import_app_main"]["median_s"] > args.max_import_seconds:
+        failures.append(f"import took {results['import_app_main']['median_s']:.3f}s > {args.max_import_seconds}s")
+    if args.max_healthz_seconds is not None and results["healthz"]["median_s"] > args.max_healthz_seconds:
+        failures.append(f"/healthz took {results['healthz']['median_s']:.3f}s > {args.max_healthz_seconds}s")
+    if failures:
+        print("Startup regression: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Deterministic benchmark corpus: synthetic txt, csv, pdf and docx files in small and large sizes
+
+The same seed always produces byte-identical files, so runs on different
+machines or commits convert exactly the same inputs. PDFs and DOCX files are
+written directly (text-only PDF, minimal WordprocessingML package), without
+extra dependencies.
+
+Usage:
+    python benchmarks/corpus.py --output benchmarks/corpus --seed 42
+"""
+
+import argparse
+import io
+import os
+import random
+import zipfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+WORDS = ["the", "report", "covers", "quarterly", "results", "and", "outlook", "for", "our", "team",
+         "revenue", "grew", "in", "most", "regions", "while", "costs", "stayed", "flat", "customers",
+         "signed", "new", "contracts", "with", "support", "from", "operations", "during", "period"]
+ENTITIES = ["John Smith", "Maria Garcia", "jane.doe@example.com", "ops@company.org",
+            "+1 555-123-4567", "(555) 987-6543", "https://example.com/docs/report.pdf",
+            "12/25/2023", "2024-01-15"]
+
+# Approximate size of each variant: paragraphs for txt/pdf/docx, rows for csv
+SIZES = {
+    "small": {"paragraphs": 20, "rows": 200},
+    "large": {"paragraphs": 2000, "rows": 50000},
+}
+
+
+def _sentence(rng: random.Random) -> str:
+    tokens = [rng.choice(ENTITIES) if rng.random() < 0.05 else rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(tokens).capitalize() + "."
+
+
+def make_document(paragraphs: int, seed: int) -> List[Tuple[str, str]]:
+    """Blocks of (kind, text): 'title', 'heading' or 'paragraph'"""
+    rng = random.Random(seed)
+    blocks = [("title", "ANNUAL OPERATIONS REPORT")]
+    for index in range(paragraphs):
+        if index % 10 == 0:
+            blocks.append(("heading", f"{index // 10 + 1}. Section {index // 10 + 1}"))
+        blocks.append(("paragraph", " ".join(_sentence(rng) for _ in range(rng.randint(2, 5)))))
+    return blocks
+
+
+def make_txt(paragraphs: int, seed: int) -> bytes:
+    return "\n\n".join(text for _, text in make_document(paragraphs, seed)).encode() + b"\n"
+
+
+def make_csv(rows: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    lines = ["id,name,email,phone,amount,date,notes"]
+    for index in range(rows):
+        name = rng.choice(["John Smith", "Maria Garcia", "Wei Chen", "Amara Okafor"])
+        email = f"{name.split()[0].lower()}{index}@example.com"
+        notes = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))
+        lines.append(
+            f'{index},{name},{email},+1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)},'
+            f'{rng.randint(100, 99999) / 100:.2f},{rng.randint(1, 12)}/{rng.randint(1, 28)}/2024,"{notes}"'
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _wrap(text: str, width: int = 95) -> List[str]:
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def make_pdf(paragraphs: int, seed: int) -> bytes:
+    """A born-digital, text-only PDF with a standard Helvetica font"""
+    lines: List[Tuple[int, str]] = []
+    for kind, text in make_document(paragraphs, seed):
+        size = 16 if kind == "title" else 13 if kind == "heading" else 10
+        lines.extend((size, line) for line in _wrap(text, 70 if size > 10 else 95))
+        lines.append((10, ""))
+
+    pages: List[List[Tuple[int, str]]] = []
+    page: List[Tuple[int, str]] = []
+    for line in lines:
+        page.append(line)
+        if len(page) >= 55:
+            pages.append(page)
+            page = []
+    if page:
+        pages.append(page)
+
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects: List[bytes] = []
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(("<< /Type /Pages /Kids [" + " ".join(f"{pid} 0 R" for pid in page_ids) +
+                    f"] /Count {len(pages)} >>").encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for index, page_lines in enumerate(pages):
+        commands = ["BT", "50 800 Td"]
+        for size, text in page_lines:
+            commands.append(f"/F1 {size} Tf 0 -{size + 4} Td ({escape(text)}) Tj")
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1", "replace")
+        objects.append((
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[index] + 1} 0 R >>"
+        ).encode())
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return output.getvalue()
+
+
+_DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>"""
+
+_DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCX_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+_DOCX_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/></w:style>
+</w:styles>"""
+
+
+def make_docx(paragraphs: int, seed: int) -> bytes:
+    """A minimal WordprocessingML package with a title, headings, paragraphs and a table"""
+    from xml.sax.saxutils import escape
+
+    styles = {"title": "Title", "heading": "Heading1"}
+    body = []
+    for kind, text in make_document(paragraphs, seed):
+        style = f'<w:pPr><w:pStyle w:val="{styles[kind]}"/></w:pPr>' if kind in styles else ""
+        body.append(f'<w:p>{style}<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+
+    rows = []
+    for row in [["Region", "Revenue", "Contact"], ["North", "1200.50", "John Smith"], ["South", "980.00", "Maria Garcia"]]:
+        cells = "".join(f"<w:tc><w:p><w:r><w:t>{escape(value)}</w:t></w:r></w:p></w:tc>" for value in row)
+        rows.append(f"<w:tr>{cells}</w:tr>")
+    body.append(f"<w:tbl>{''.join(rows)}</w:tbl>")
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        # Fixed timestamps keep the archive byte-identical between runs
+        for name, content in [
+            ("[Content_Types].xml", _DOCX_CONTENT_TYPES),
+            ("_rels/.rels", _DOCX_RELS),
+            ("word/_rels/document.xml.rels", _DOCX_DOCUMENT_RELS),
+            ("word/styles.xml", _DOCX_STYLES),
+            ("word/document.xml", document),
+        ]:
+            archive.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), content)
+    return output.getvalue()
+
+
+# Generator and size parameter per file extension
+GENERATORS: Dict[str, Tuple[Callable[[int, int], bytes], str]] = {
+    "txt": (make_txt, "paragraphs"),
+    "csv": (make_csv, "rows"),
+    "pdf": (make_pdf, "paragraphs"),
+    "docx": (make_docx, "paragraphs"),
+}
+
+
+def make_file(kind: str, size: str, seed: int = 42) -> bytes:
+    """Content of one corpus file, e.g. make_file('pdf', 'small')"""
+    generator, parameter = GENERATORS[kind]
+    return generator(SIZES[size][parameter], seed)
+
+
+def generate(output_dir: str, seed: int = 42, kinds: Optional[List[str]] = None,
+             sizes: Optional[List[str]] = None) -> List[str]:
+    """Write the corpus to ``output_dir`` and return the file paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for kind in kinds or list(GENERATORS):
+        for size in sizes or list(SIZES):
+            path = os.path.join(output_dir, f"{size}.{kind}")
+            with open(path, "wb") as f:
+                f.write(make_file(kind, size, seed))
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(__file__), "corpus"), help="Output directory")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--kinds", nargs="+", choices=list(GENERATORS), help="File types to generate")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), help="Sizes to generate")
+    args = parser.parse_args()
+
+    for path in generate(args.output, args.seed, args.kinds, args.sizes):
+        print(f"{path}  {os.path.getsize(path):>10} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Load test: end-to-end /upload/ latency percentiles under N concurrent clients
+
+Starts the API with uvicorn against a throwaway SQLite database (or the
+database given with --database-url, e.g. a local Postgres), or targets a
+running server with --url. Payloads come from the benchmark corpus and are
+generated before the clock starts. By default every request uploads a
+different file (a different corpus seed), so the duplicate check does not
+answer from the database; --duplicates uploads the same file every time.
+
+Usage:
+    python benchmarks/load_test.py --clients 8 --requests 200 --kinds txt csv --output results/load.json
+    python benchmarks/load_test.py --url http://localhost:8000 --clients 4 --requests 50
+    python benchmarks/load_test.py --database-url postgresql://postgres@localhost/docling_bench
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from corpus import make_file
+from results import REPO_ROOT, percentile, write_results
+
+CONTENT_TYPES = {
+    "txt": "text/plain",
+    "csv": "text/csv",
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, workdir: str, port: int,
+                 extra_env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=database_url,
+        BLOB_STORE_PATH=os.path.join(workdir, "blobs"),
+        JOB_SPOOL_DIR=os.path.join(workdir, "jobs"),
+    )
+    env.update(extra_env or {})
+    log = open(os.path.join(workdir, "server.log"), "wb")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=REPO_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+def wait_until_ready(url: str, timeout: float, server: Optional[subprocess.Popen] = None, path: str = "/readyz",
+                     poll_interval: float = 0.5):
+    """Poll ``path`` until it answers 200"""
+    parsed = urllib.parse.urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=5)
+            conn.request("GET", path)
+            if conn.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(poll_interval)
+    raise RuntimeError(f"Server at {url} not ready after {timeout:.0f}s")
+
+
+def multipart(filename: str, content: bytes, content_type: str) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def build_payloads(kinds: List[str], size: str, count: int, duplicates: bool, seed: int) -> List[Dict[str, Any]]:
+    payloads = []
+    cache: Dict[Tuple[str, int], bytes] = {}
+    for index in range(count):
+        kind = kinds[index % len(kinds)]
+        file_seed = seed if duplicates else seed + index
+        if (kind, file_seed) not in cache:
+            cache[(kind, file_seed)] = make_file(kind, size, file_seed)
+        filename = f"{size}-{file_seed}.{kind}"
+        body, content_type = multipart(filename, cache[(kind, file_seed)], CONTENT_TYPES[kind])
+        payloads.append({"kind": kind, "body": body, "content_type": content_type})
+    return payloads
+
+
+def run_clients(url: str, path: str, payloads: List[Dict[str, Any]], clients: int, timeout: float) -> List[Dict[str, Any]]:
+    parsed = urllib.parse.urlsplit(url)
+    samples: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+    next_index = iter(range(len(payloads)))
+
+    def client():
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+        while True:
+            with lock:
+                index = next(next_index, None)
+            if index is None:
+                break
+            payload = payloads[index]
+            sample = {"kind": payload["kind"]}
+            start = time.perf_counter()
+            try:
+                conn.request("POST", path, body=payload["body"], headers={"Content-Type": payload["content_type"]})
+                response = conn.getresponse()
+                data = response.read()
+                sample["http_status"] = response.status
+                if response.status == 200:
+                    sample["status"] = json.loads(data).get("status")
+            except (OSError, http.client.HTTPException) as e:
+                sample["http_status"] = None
+                sample["error"] = str(e)
+                conn.close()
+                conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+            sample["latency_s"] = time.perf_counter() - start
+            with lock:
+                samples.append(sample)
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(sample["latency_s"] for sample in samples if sample.get("http_status") == 200)
+    summary: Dict[str, Any] = {
+        "requests": len(samples),
+        "succeeded": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else None,
+        "http_status": dict(Counter(str(sample.get("http_status")) for sample in samples)),
+        "result_status": dict(Counter(sample["status"] for sample in samples if sample.get("status"))),
+    }
+    if latencies:
+        summary["latency_s"] = {
+            "mean": statistics.mean(latencies),
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1],
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target a running server instead of starting one")
+    parser.add_argument("--database-url", help="Database for the started server (default: temporary SQLite)")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=40, help="Total uploads")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed uploads before the run")
+    parser.add_argument("--kinds", nargs="+", choices=list(CONTENT_TYPES), default=["txt", "csv"], help="File types to upload")
+    parser.add_argument("--size", choices=["small", "large"], default="small", help="Corpus size of each upload")
+    parser.add_argument("--duplicates", action="store_true", help="Upload the same file every time")
+    parser.add_argument("--profile", help="Pipeline profile query parameter for /upload/")
+    parser.add_argument("--seed", type=int, default=42, help="Base corpus seed")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request timeout in seconds")
+    parser.add_argument("--startup-timeout", type=float, default=300, help="Seconds to wait for the server")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    path = "/upload/"
+    if args.profile:
+        path += "?" + urllib.parse.urlencode({"profile": args.profile})
+
+    # Unique warm-up payloads use their own seeds so they never turn timed uploads into
+    # duplicates; with --duplicates they store the file the timed run then hits
+    warmup_seed = args.seed if args.duplicates else args.seed + 1_000_000
+    warmup = build_payloads(args.kinds, args.size, args.warmup, args.duplicates, warmup_seed)
+    payloads = build_payloads(args.kinds, args.size, args.requests, args.duplicates, args.seed)
+
+    workdir = tempfile.mkdtemp(prefix="docling_load_")
+    server = None
+    url = args.url
+    try:
+        if not url:
+            port = free_port()
+            database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'load.db')}"
+            server = start_server(database_url, workdir, port)
+            url = f"http://127.0.0.1:{port}"
+            print(f"Started server on {url} ({database_url.split('://')[0]})")
+        wait_until_ready(url, args.startup_timeout, server)
+
+        if warmup:
+            run_clients(url, path, warmup, 1, args.timeout)
+
+        print(f"Uploading {len(payloads)} files with {args.clients} clients")
+        start = time.perf_counter()
+        samples = run_clients(url, path, payloads, args.clients, args.timeout)
+        summary = summarize(samples, time.perf_counter() - start)
+        summary["by_kind"] = {
+            kind: summarize([sample for sample in samples if sample["kind"] == kind], summary["elapsed_s"])
+            for kind in args.kinds
+        }
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latency = summary.get("latency_s", {})
+    print(f"Succeeded {summary['succeeded']}/{summary['requests']} in {summary['elapsed_s']:.2f}s "
+          f"({summary['throughput_rps'] or 0:.1f} req/s), HTTP status {summary['http_status']}")
+    if latency:
+        print("Latency (ms): " + "  ".join(f"{name} {value * 1000:.1f}" for name, value in latency.items()))
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "database_url")}
+    params["database"] = "external" if args.url else (args.database_url or "sqlite").split("://")[0]
+    write_results(args.output, "load_upload", params, summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,18 +16,130 @@ uploadArea.addEventListener('dragleave', () => {
 uploadArea.addEventListener('drop', (e) => {
     e.preventDefault();
     uploadArea.classList.remove('dragover');
-    const files = e.dataTransfer.files;
-    if (files.length > 0) {
-        handleFile(files[0]);
-    }
+    handleFiles(e.dataTransfer.files);
 });
 
 fileInput.addEventListener('change', (e) => {
-    if (e.target.files.length > 0) {
-        handleFile(e.target.files[0]);
-    }
+    handleFiles(e.target.files);
 });
 
+const ARCHIVE_PATTERN = /\.(zip|tar|tgz|tar\.gz|tar\.bz2|tar\.xz)$/i;
+
+function handleFiles(files) {
+    if (files.length === 0) {
+        return;
+    }
+    // Several files or an archive go through the batch endpoint in one request
+    if (files.length > 1 || ARCHIVE_PATTERN.test(files[0].name)) {
+        handleBatch(files);
+    } else {
+        handleFile(files[0]);
+    }
+}
+
+async function handleBatch(files) {
+    const formData = new FormData();
+    for (const file of files) {
+        formData.append('files', file);
+    }
+    
+    loading.style.display = 'block';
+    loading.classList.add('show');
+    result.className = 'result info';
+    result.style.display = 'block';
+    result.innerHTML = '<h3>Batch results</h3><ul class="batch-results"></ul>';
+    const list = result.querySelector('.batch-results');
+    
+    try {
+        const response = await fetch('/upload/batch', {
+            method: 'POST',
+            body: formData
+        });
+        
+        if (!response.ok) {
+            const data = await response.json();
+            showResult('error', data.detail || 'An error occurred');
+            return;
+        }
+        
+        // Results arrive as NDJSON, one line per file as soon as it is done
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            for (const line of lines) {
+                if (line.trim()) {
+                    appendBatchResult(list, JSON.parse(line));
+                }
+            }
+        }
+        if (buffer.trim()) {
+            appendBatchResult(list, JSON.parse(buffer));
+        }
+        result.className = 'result success';
+    } catch (error) {
+        showResult('error', 'Network error: ' + error.message);
+    } finally {
+        loading.style.display = 'none';
+        loading.classList.remove('show');
+    }
+}
+
+function appendBatchResult(list, item) {
+    const emoji = {
+        processed: '✨',
+        already_available: '🔄',
+        duplicate_in_batch: '📋',
+        failed: '❌'
+    }[item.status] || '•';
+    const entry = document.createElement('li');
+    entry.textContent = `${emoji} ${item.filename} - ${item.status}` +
+        (item.file_id ? ` (id ${item.file_id})` : '') +
+        (item.error ? `: ${item.error}` : '');
+    list.appendChild(entry);
+}
+
+async function sha256Hex(file) {
+    // crypto.subtle is only available in secure contexts (https or localhost)
+    if (!window.crypto || !window.crypto.subtle) {
+        return null;
+    }
+    const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+async function findExistingResult(fileHash) {
+    // Ask the server about the hash before sending any file bytes
+    const head = await fetch(`/files/by-hash/${fileHash}`, { method: 'HEAD' });
+    if (!head.ok) {
+        return null;
+    }
+    
+    const fileId = head.headers.get('X-File-Id');
+    const response = await fetch(`/files/${fileId}/json`);
+    if (!response.ok) {
+        return null;
+    }
+    
+    const record = await response.json();
+    return {
+        status: 'already_available',
+        message: 'File already available in database',
+        data: record.data,
+        filename: record.filename,
+        file_type: record.file_type,
+        file_hash: fileHash,
+        created_at: record.created_at
+    };
+}
+
 async function handleFile(file) {
     const formData = new FormData();
     formData.append('file', file);
@@ -42,9 +154,23 @@ async function handleFile(file) {
     loadingText.textContent = 'Checking if file already exists...';
     
     try {
+        let fileHash = null;
+        try {
+            fileHash = await sha256Hex(file);
+            const existing = fileHash ? await findExistingResult(fileHash) : null;
+            if (existing) {
+                showResult('success', existing.message, existing);
+                return;
+            }
+        } catch (error) {
+            // Fall back to a regular upload
+            fileHash = null;
+        }
+        
         const response = await fetch('/upload/', {
             method: 'POST',
-            body: formData
+            body: formData,
+            headers: fileHash ? { 'X-File-SHA256': fileHash } : {}
         });
         
         const data = await response.json();
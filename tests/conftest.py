@@ -0,0 +1,10 @@
+"""
+Test settings applied before any app module is imported
+"""
+
+import os
+import tempfile
+
+# app.database builds its engine on import; tests always get a throwaway SQLite database
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'files.db')}"
+os.environ["STARTUP_WARMUP"] = "off"
@@ -0,0 +1,66 @@
+"""
+Chunks produced on demand and streamed into file_chunks
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.chunking import chunk_conversion, spool_chunks, store_result_chunks, take_chunks
+from app.database import SessionLocal, FileChunk, init_db
+
+
+class _Conversion:
+    def __init__(self, document):
+        self.document = document
+
+
+class _BrokenDocument:
+    def iterate_items(self):
+        raise RuntimeError("broken")
+
+
+def _document():
+    from docling_core.types.doc import DoclingDocument
+
+    document = DoclingDocument(name="report")
+    for number in range(1, 6):
+        document.add_heading(text=f"Part {number}", level=1)
+        document.add_text(label="paragraph", text=f"Paragraph {number} " + "word " * 60)
+    return document
+
+
+def test_chunks_are_counted_while_they_are_inserted():
+    init_db()
+    json_data = {"metadata": {}, "chunks": chunk_conversion(_Conversion(_document()), "", size=200, overlap=20)}
+    chunks = take_chunks(json_data)
+    assert "chunks" not in json_data
+
+    db = SessionLocal()
+    try:
+        store_result_chunks(db, 1, "a" * 64, json_data, chunks)
+        rows = db.query(FileChunk.chunk_index, FileChunk.heading).filter(FileChunk.file_id == 1).order_by(FileChunk.chunk_index).all()
+        db.rollback()
+    finally:
+        db.close()
+
+    assert json_data["metadata"]["chunk_count"] == len(rows) > 1
+    assert [index for index, _ in rows] == list(range(len(rows)))
+    assert rows[0].heading == "Part 1"
+
+
+def test_spooled_chunks_read_back_the_same_chunks(tmp_path):
+    chunks = chunk_conversion(_Conversion(_document()), "", size=200, overlap=20)
+    spooled = spool_chunks(chunks, str(tmp_path))
+
+    assert list(spooled) == list(chunks)
+    spooled.cleanup()
+    assert not os.path.exists(spooled.path)
+
+
+def test_failed_document_chunking_falls_back_to_text():
+    text = "Intro\n\nFirst paragraph.\n\nSecond paragraph."
+    chunks = chunk_conversion(_Conversion(_BrokenDocument()), text, size=200, overlap=20)
+
+    assert [chunk["text"] for chunk in chunks] == ["Intro\n\nFirst paragraph.\n\nSecond paragraph."]
@@ -0,0 +1,51 @@
+"""
+Entity extraction: every type is found independently, overlaps included
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.entities import EntityExtractor
+
+
+def _values(text: str):
+    entities, _ = EntityExtractor().extract(text)
+    return {(entity["type"], entity["value"]) for entity in entities}
+
+
+def test_email_in_url_query_is_found():
+    assert _values("see https://ex.com/a?u=bob@mail.com") >= {
+        ("url", "https://ex.com/a?u=bob"),
+        ("email", "bob@mail.com"),
+    }
+
+
+def test_person_after_url_path_is_found():
+    assert _values("at https://site.org/John Smith") >= {
+        ("url", "https://site.org/John"),
+        ("person", "John Smith"),
+    }
+
+
+def test_person_overlapping_email_is_found():
+    assert _values("Mary Ann@x.com") == {("person", "Mary Ann"), ("email", "Ann@x.com")}
+
+
+def test_offsets_and_counts_cover_every_occurrence():
+    text = "call John Smith on 12/25/2023 or John Smith at (555) 987-6543"
+    entities, counts = EntityExtractor().extract(text)
+    person = next(entity for entity in entities if entity["type"] == "person")
+    assert person["offsets"] == [[5, 15], [33, 43]]
+    assert counts["person"] == 2 and counts["date"] == 1 and counts["phone"] == 1
+
+
+def test_total_entities_adds_up_the_per_type_counts():
+    from app.file_processor import FileProcessor
+
+    entities, counts = EntityExtractor().extract("John Smith, John Smith and jane@example.com")
+    statistics = FileProcessor()._build_statistics(entities, counts, [])
+    per_type = sum(statistics[f"{entity_type}_count"] for entity_type in ("email", "phone", "url", "date", "person"))
+    assert statistics["total_entities"] == per_type == 3
+    assert statistics["distinct_entities"] == 2
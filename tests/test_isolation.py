@@ -0,0 +1,43 @@
+"""
+Worker replacement in the isolated conversion pool
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.isolation import ConversionLimitError, IsolatedWorkerPool
+
+
+def test_pool_is_ready_again_after_a_worker_is_replaced():
+    pool = IsolatedWorkerPool(size=1, timeout=0.5, max_rss_mb=0)
+    try:
+        pool.warm_up()
+        assert pool.ready
+
+        with pytest.raises(ConversionLimitError):
+            pool.submit(time.sleep, 5).result()
+
+        deadline = time.monotonic() + 30
+        while not pool.ready and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert pool.ready
+        assert pool.submit(abs, -3).result() == 3
+    finally:
+        pool.shutdown()
+
+
+def test_shutdown_does_not_replace_busy_workers():
+    pool = IsolatedWorkerPool(size=1, timeout=0, max_rss_mb=0)
+    pool.warm_up()
+    busy = pool.submit(time.sleep, 30)
+    time.sleep(0.5)
+
+    pool.shutdown()
+    with pytest.raises(ConversionLimitError):
+        busy.result(timeout=10)
+    assert pool._workers == []
@@ -0,0 +1,68 @@
+"""
+Keyset pagination of GET /files/ over rows sharing a timestamp (SQLite)
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+# app.main mounts static/ relative to the working directory
+os.chdir(ROOT)
+
+from fastapi import Response
+
+from app.database import SessionLocal, FileRecord, init_db
+from app.main import list_files
+
+
+def _page_through(db, limit: int):
+    pages, cursor = [], None
+    while True:
+        response = Response()
+        files = list_files(response, limit=limit, cursor=cursor, file_type=None, filename_prefix=None, db=db)
+        pages.append([file.id for file in files])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None or len(pages) > 10:
+            return pages
+
+
+def _reset(db):
+    db.query(FileRecord).delete()
+    db.commit()
+
+
+def test_rows_inserted_together_are_each_listed_once():
+    init_db()
+    db = SessionLocal()
+    try:
+        _reset(db)
+        # Inserted in one flush, as batch uploads do
+        records = [FileRecord(filename=f"{i}.txt", file_hash=f"together-{i}", file_type="txt") for i in range(5)]
+        db.add_all(records)
+        db.commit()
+        ids = sorted((record.id for record in records), reverse=True)
+
+        assert _page_through(db, 2) == [ids[0:2], ids[2:4], ids[4:5]]
+    finally:
+        db.close()
+
+
+def test_rows_sharing_one_timestamp_are_each_listed_once():
+    init_db()
+    db = SessionLocal()
+    try:
+        _reset(db)
+        created_at = datetime(2026, 10, 18, 0, 12, 2, tzinfo=timezone.utc)
+        records = [
+            FileRecord(filename=f"{i}.txt", file_hash=f"shared-{i}", file_type="txt", created_at=created_at)
+            for i in range(5)
+        ]
+        db.add_all(records)
+        db.commit()
+        ids = sorted((record.id for record in records), reverse=True)
+
+        assert _page_through(db, 2) == [ids[0:2], ids[2:4], ids[4:5]]
+    finally:
+        db.close()
@@ -0,0 +1,55 @@
+"""
+Which stored results answer a request: profiles and page ranges
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.pipeline_profiles import ConversionOptions
+
+
+def test_cheaper_profile_does_not_answer_richer_request():
+    fast_text = {"pipeline_profile": "fast-text"}
+    assert not ConversionOptions("full-ocr").served_by(fast_text, "pdf")
+    assert not ConversionOptions("default").served_by(fast_text, "pdf")
+    assert ConversionOptions("fast-text").served_by(fast_text, "pdf")
+
+
+def test_richer_profile_answers_cheaper_request():
+    assert ConversionOptions("default").served_by({"pipeline_profile": "full-ocr"}, "pdf")
+    assert ConversionOptions("tables").served_by({"pipeline_profile": "default"}, "png")
+    # Results stored before profiles were converted with the defaults
+    assert ConversionOptions("default").served_by({}, "pdf")
+    assert not ConversionOptions("full-ocr").served_by({}, "pdf")
+
+
+def test_profile_is_ignored_for_formats_it_does_not_change():
+    assert ConversionOptions("full-ocr").served_by({"pipeline_profile": "fast-text"}, "docx")
+
+
+def test_page_range_only_applies_to_paginated_formats():
+    limited = ConversionOptions(max_pages=2)
+    assert limited.to_metadata()["page_range"] == [1, 2]
+    assert "page_range" not in limited.for_file_type("txt").to_metadata()
+    assert limited.for_file_type("pdf") is limited
+
+    assert not ConversionOptions().served_by({"page_range": [1, 2]}, "pdf")
+    assert limited.served_by({"page_range": [1, 2]}, "pdf")
+    # Results stored with a page range for formats without pages
+    assert ConversionOptions().served_by({"page_range": [1, 2]}, "txt")
+
+
+def test_stored_page_range_gives_the_same_conversion_key():
+    from app.conversion_cache import conversion_key
+
+    requested = ConversionOptions("fast-text", page_start=3, max_pages=2)
+    metadata = requested.to_metadata()
+    stored = ConversionOptions.from_metadata(metadata, keep_pages=True)
+
+    assert stored.to_metadata() == metadata
+    assert conversion_key("a" * 64, "pdf", "report.pdf", stored) == conversion_key("a" * 64, "pdf", "report.pdf", requested)
+    # Reprocessing otherwise converts the whole file
+    assert ConversionOptions.from_metadata(metadata).page_range is None
+    assert ConversionOptions.from_metadata({"page_range": [1, None]}, keep_pages=True).to_metadata()["page_range"] == [1, None]
@@ -0,0 +1,52 @@
+"""
+Sections built from DoclingDocument items
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.native_formats import _table
+from app.sections import iter_sections_from_document
+
+
+def test_tables_are_kept_in_section_content():
+    from docling_core.types.doc import DoclingDocument
+
+    document = DoclingDocument(name="report")
+    document.add_heading(text="Results", level=1)
+    document.add_text(label="paragraph", text="Quarterly figures:")
+    document.add_table(data=_table([["region", "revenue"], ["north", "120"]], 2))
+
+    sections = list(iter_sections_from_document(document))
+    assert [section["title"] for section in sections] == ["Results"]
+    assert "Quarterly figures:" in sections[0]["content"]
+    assert "north" in sections[0]["content"] and "120" in sections[0]["content"]
+
+
+def test_csv_results_have_sections(tmp_path):
+    from app.file_processor import FileProcessor
+    from app.native_formats import convert_csv
+
+    text = "name,city\nJohn Smith,Boston\nMaria Garcia,Madrid\nLi Wei,Beijing\n"
+    path = tmp_path / "people.csv"
+    path.write_text(text)
+
+    conversion = convert_csv(str(path), "people.csv")
+    assert conversion.text == text
+
+    sections = FileProcessor().extract_sections(conversion, conversion.text)
+    assert [section["title"] for section in sections] == ["Main Content"]
+    assert "Maria Garcia" in sections[0]["content"] and "Beijing" in sections[0]["content"]
+
+
+def test_documents_without_text_items_fall_back_to_text_sections():
+    from docling_core.types.doc import DoclingDocument
+
+    from app.file_processor import FileProcessor
+    from app.native_formats import NativeConversion
+
+    conversion = NativeConversion(DoclingDocument(name="scan"))
+    sections = FileProcessor().extract_sections(conversion, "SUMMARY\nSome text")
+    assert sections == [{"title": "SUMMARY", "content": "Some text\n", "level": 1}]